@@ -7,13 +7,13 @@ appointments_bp = Blueprint('appointments', __name__, url_prefix='/api/appointme
 @appointments_bp.route('/availability', methods=['GET'])
 @jwt_required()
 def get_availability():
-    from models.user import User
     from models.appointment import Appointment
-    from flask_jwt_extended import get_jwt
+    from services.authorization import current_claims
 
-    user_id = get_jwt_identity()
-    claims = get_jwt()
-    user = User.query.get(user_id)
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
 
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -63,11 +63,11 @@ def get_availability():
     for slot in slots:
         if not slot['available']:
             # Dr. Saulo sees all details
-            if user.is_dr_saulo:
+            if claims.get('is_dr_saulo'):
                 appointment = Appointment.query.get(slot['appointment_id'])
                 slot['appointment'] = appointment.to_dict(include_details=True)
             # Secretary only sees their clinic's details
-            elif slot['clinic_id'] == str(user.clinic_id):
+            elif slot['clinic_id'] == claims.get('clinic_id'):
                 appointment = Appointment.query.get(slot['appointment_id'])
                 slot['appointment'] = appointment.to_dict(include_details=True)
             # Hide details for other clinics
@@ -168,11 +168,13 @@ def create_appointment():
 @appointments_bp.route('/<appointment_id>', methods=['GET'])
 @jwt_required()
 def get_appointment(appointment_id):
-    from models.user import User
     from models.appointment import Appointment
+    from services.authorization import current_claims, can_access_clinic
 
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
 
     appointment = Appointment.query.get(appointment_id)
 
@@ -180,7 +182,7 @@ def get_appointment(appointment_id):
         return jsonify({'error': 'Appointment not found'}), 404
 
     # Check permissions
-    if not user.is_dr_saulo and str(appointment.clinic_id) != str(user.clinic_id):
+    if not can_access_clinic(claims, appointment.clinic_id):
         return jsonify({'error': 'Access denied'}), 403
 
     return jsonify({
@@ -190,12 +192,14 @@ def get_appointment(appointment_id):
 @appointments_bp.route('/<appointment_id>', methods=['DELETE'])
 @jwt_required()
 def delete_appointment(appointment_id):
-    from models.user import User
     from models.appointment import Appointment
     from extensions import db
+    from services.authorization import current_claims, can_access_clinic
 
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
 
     appointment = Appointment.query.get(appointment_id)
 
@@ -203,7 +207,7 @@ def delete_appointment(appointment_id):
         return jsonify({'error': 'Appointment not found'}), 404
 
     # Check permissions
-    if not user.is_dr_saulo and str(appointment.clinic_id) != str(user.clinic_id):
+    if not can_access_clinic(claims, appointment.clinic_id):
         return jsonify({'error': 'Access denied'}), 403
 
     # Soft delete - mark as cancelled instead of actually deleting
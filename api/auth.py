@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from extensions import rate_limiter
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limiter.limit('login')
 def login():
     from models.user import User
 
@@ -20,6 +22,11 @@ def login():
     if not user.is_active:
         return jsonify({'error': 'Account disabled'}), 403
 
+    # Legacy PBKDF2 hashes and old bcrypt costs are upgraded transparently
+    if user.rehash_password_if_needed(data['password']):
+        from extensions import db
+        db.session.commit()
+
     # Create JWT token with additional claims
     additional_claims = {
         'email': user.email,
@@ -7,54 +7,704 @@ consultations_bp = Blueprint('consultations', __name__, url_prefix='/api/consult
 @consultations_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_consultations():
-    from models.exam import Consultation
+    """
+    Consultation feed, newest appointment first, paginated by cursor
+    The JSON document is assembled by Postgres and returned as-is
+    """
+    from models.exam import Consultation, clinical_tsquery
     from models.appointment import Appointment
     from models.patient import Animal, Tutor
-    from sqlalchemy.orm import joinedload
+    from utils.pagination import encode_cursor, decode_cursor
+    from extensions import db
+    from flask import current_app
+    from sqlalchemy import select, func, tuple_, cast, Text, text
+    from sqlalchemy.dialects.postgresql import aggregate_order_by
+    import json
 
     search = request.args.get('search', '')
-    page = request.args.get('page', 1, type=int)
-    limit = request.args.get('limit', 50, type=int)
+    cursor = request.args.get('cursor')
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
 
-    query = Consultation.query.options(
-        joinedload(Consultation.appointment).joinedload(Appointment.animal).joinedload(Animal.tutor)
+    item = func.json_build_object(
+        'id', Consultation.id,
+        'appointment_id', Consultation.appointment_id,
+        'chief_complaint', Consultation.chief_complaint,
+        'diagnosis', Consultation.diagnosis,
+        'treatment_plan', Consultation.treatment_plan,
+        'prognosis', Consultation.prognosis,
+        'created_at', Consultation.created_at,
+        'appointment', func.json_build_object(
+            'datetime', Appointment.datetime,
+            'service_type', Appointment.service_type,
+            'animal', func.json_build_object(
+                'id', Animal.id,
+                'name', Animal.name,
+                'species', Animal.species,
+                'tutor', func.json_build_object('name', Tutor.name)
+            )
+        )
+    )
+
+    page = select(
+        item.label('item'),
+        Appointment.datetime.label('sort_datetime'),
+        Consultation.id.label('sort_id')
+    ).select_from(Consultation).join(
+        Appointment, Appointment.id == Consultation.appointment_id
+    ).join(
+        Animal, Animal.id == Appointment.animal_id
+    ).join(
+        Tutor, Tutor.id == Animal.tutor_id
     )
 
     if search:
-        query = query.join(Appointment).join(Animal).join(Tutor).filter(
+        page = page.where(
             (Animal.name.ilike(f'%{search}%')) |
             (Tutor.name.ilike(f'%{search}%')) |
-            (Consultation.diagnosis.ilike(f'%{search}%')) |
-            (Consultation.chief_complaint.ilike(f'%{search}%'))
+            (Consultation.search_vector.op('@@')(clinical_tsquery(search)))
+        )
+
+    if cursor:
+        try:
+            after_datetime, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        page = page.where(tuple_(Appointment.datetime, Consultation.id) < tuple_(after_datetime, after_id))
+
+    # One extra row tells whether another page exists
+    page = page.order_by(
+        Appointment.datetime.desc(), Consultation.id.desc()
+    ).limit(limit + 1).subquery('page')
+
+    ranked = select(
+        page,
+        func.row_number().over(order_by=(page.c.sort_datetime.desc(), page.c.sort_id.desc())).label('ordinal')
+    ).subquery('ranked')
+
+    on_page = ranked.c.ordinal <= limit
+    last = ranked.c.ordinal == limit
+
+    row = db.session.execute(select(
+        cast(func.coalesce(
+            func.json_agg(aggregate_order_by(ranked.c.item, ranked.c.ordinal)).filter(on_page),
+            text("'[]'::json")
+        ), Text).label('items'),
+        (func.count() > limit).label('has_more'),
+        func.max(ranked.c.sort_datetime).filter(last).label('last_datetime'),
+        func.max(cast(ranked.c.sort_id, Text)).filter(last).label('last_id')
+    )).one()
+
+    next_cursor = encode_cursor(row.last_datetime, row.last_id) if row.has_more else None
+
+    body = '{"consultations":%s,"next_cursor":%s}' % (row.items, json.dumps(next_cursor))
+    return current_app.response_class(body, status=200, mimetype='application/json')
+
+@consultations_bp.route('', methods=['POST'])
+@consultations_bp.route('/', methods=['POST'])
+@jwt_required()
+def create_consultation():
+    """
+    Create a consultation and its exam results in a single transaction
+    The appointment is validated once and marked as completed
+    """
+    from models.exam import Consultation, ExamResult, ExamImage, ExamLabValue
+    from models.appointment import Appointment
+    from models.patient import AnimalWeight
+    from services.consultation_revisions import ConsultationRevisionService
+    from extensions import db
+    from services.authorization import current_claims, can_access_clinic
+    from datetime import datetime
+    import uuid
+
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
+
+    data = request.get_json()
+
+    if not data or not data.get('appointment_id'):
+        return jsonify({'error': 'appointment_id required'}), 400
+
+    exams_data = data.get('exam_results', [])
+    if not isinstance(exams_data, list):
+        return jsonify({'error': 'exam_results must be a list'}), 400
+
+    weight = data.get('weight')
+    if weight is not None:
+        try:
+            weight = round(float(weight), 2)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'weight must be a number'}), 400
+        if not 0 < weight < 1000:
+            return jsonify({'error': 'weight must be between 0 and 999.99'}), 400
+
+    # Validate exam payloads before touching the database
+    exam_dates = []
+    exam_lab_values = []
+    exam_images = []
+    for i, exam_data in enumerate(exams_data):
+        if not isinstance(exam_data, dict):
+            return jsonify({'error': f'Exam result {i + 1}: must be an object'}), 400
+        if not all(exam_data.get(field) for field in ['exam_type', 'findings', 'impression']):
+            return jsonify({'error': f'Exam result {i + 1}: exam_type, findings and impression required'}), 400
+        try:
+            exam_dates.append(
+                datetime.fromisoformat(exam_data['exam_date']).date() if exam_data.get('exam_date')
+                else datetime.utcnow().date()
+            )
+        except (TypeError, ValueError):
+            return jsonify({'error': f'Exam result {i + 1}: invalid exam_date format'}), 400
+
+        lab_values = exam_data.get('lab_values') or []
+        if not isinstance(lab_values, list):
+            return jsonify({'error': f'Exam result {i + 1}: lab_values must be a list'}), 400
+        try:
+            exam_lab_values.append([ExamLabValue.from_payload(item) for item in lab_values])
+        except ValueError as e:
+            return jsonify({'error': f'Exam result {i + 1}: {e}'}), 400
+
+        try:
+            exam_images.append(ExamImage.from_urls(exam_data.get('images_url')))
+        except ValueError:
+            return jsonify({'error': f'Exam result {i + 1}: images_url must be a list of URLs'}), 400
+
+    # Lock the appointment so two concurrent submissions cannot both create a consultation
+    appointment = db.session.query(Appointment).with_for_update().filter_by(
+        id=data['appointment_id']
+    ).first()
+
+    if not appointment:
+        return jsonify({'error': 'Appointment not found'}), 404
+
+    if not can_access_clinic(claims, appointment.clinic_id):
+        return jsonify({'error': 'Access denied'}), 403
+
+    if appointment.status == 'cancelled':
+        return jsonify({'error': 'Appointment is cancelled'}), 400
+
+    if db.session.query(Consultation.id).filter_by(appointment_id=appointment.id).first():
+        return jsonify({'error': 'Consultation already exists for this appointment'}), 409
+
+    # Ids are generated up front so the exam rows need no intermediate flush
+    consultation = Consultation(
+        id=uuid.uuid4(),
+        appointment_id=appointment.id,
+        chief_complaint=data.get('chief_complaint'),
+        physical_exam=data.get('physical_exam'),
+        diagnosis=data.get('diagnosis'),
+        prognosis=data.get('prognosis'),
+        treatment_plan=data.get('treatment_plan'),
+        notes=data.get('notes')
+    )
+
+    access_codes = ExamResult.generate_access_codes(len(exams_data)) if exams_data else []
+
+    exam_results = [
+        ExamResult(
+            id=uuid.uuid4(),
+            consultation_id=consultation.id,
+            animal_id=appointment.animal_id,
+            exam_type=exam_data['exam_type'],
+            access_code=access_code,
+            findings=exam_data['findings'],
+            impression=exam_data['impression'],
+            pdf_url=exam_data.get('pdf_url'),
+            images=images,
+            exam_date=exam_date,
+            lab_values=lab_values
         )
-    else:
-        # Need to join Appointment for ordering even without search
-        query = query.join(Appointment)
+        for exam_data, exam_date, lab_values, images, access_code in zip(
+            exams_data, exam_dates, exam_lab_values, exam_images, access_codes
+        )
+    ]
+
+    appointment.status = 'completed'
+
+    # The weight measured at the consultation updates the animal and its history
+    if weight is not None:
+        appointment.animal.weight = weight
+        db.session.add(AnimalWeight(animal_id=appointment.animal_id, weight=weight, consultation_id=consultation.id))
+
+    db.session.add(consultation)
+    db.session.add_all(exam_results)
+    ConsultationRevisionService(db.session).record_initial(consultation, get_jwt_identity())
+
+    # Single flush for the consultation, exams, images, lab values and initial revision
+    db.session.flush()
+
+    # Serialize before commit so the expired objects are not reloaded one by one
+    result = consultation.to_dict()
+    result['exam_results'] = [
+        {**exam.to_dict(include_sensitive=True), 'lab_values': [value.to_dict() for value in exam.lab_values]}
+        for exam in exam_results
+    ]
+
+    db.session.commit()
+
+    return jsonify({'consultation': result}), 201
+
+def _get_accessible_consultation(consultation_id):
+    """Load a consultation, returning (consultation, error_response)"""
+    from models.exam import Consultation
+    from services.authorization import current_claims, can_access_clinic
+
+    claims = current_claims()
+    if not claims:
+        return None, (jsonify({'error': 'Access denied'}), 403)
+
+    consultation = Consultation.query.get(consultation_id)
+
+    if not consultation:
+        return None, (jsonify({'error': 'Consultation not found'}), 404)
+
+    if not can_access_clinic(claims, consultation.appointment.clinic_id):
+        return None, (jsonify({'error': 'Access denied'}), 403)
+
+    return consultation, None
+
+@consultations_bp.route('/<consultation_id>/draft', methods=['PATCH'])
+@jwt_required()
+def save_consultation_draft(consultation_id):
+    """
+    Autosave a consultation draft from a JSON-Patch/text-delta against a known version
+    Returns 409 with the current version when the draft is stale
+    """
+    from models.exam import Consultation
+    from services.consultation_revisions import ConsultationRevisionService
+    from utils.deltas import apply_patch, DeltaError, PatchTestFailed
+    from extensions import db
+    from sqlalchemy.orm.exc import StaleDataError
+
+    data = request.get_json()
+
+    if not data or not isinstance(data.get('version'), int) or 'patch' not in data:
+        return jsonify({'error': 'version and patch required'}), 400
+
+    consultation, error = _get_accessible_consultation(consultation_id)
+    if error:
+        return error
+
+    if consultation.version != data['version']:
+        return jsonify({'error': 'Version conflict', 'current_version': consultation.version}), 409
+
+    before = consultation.editable_values()
+
+    try:
+        after = apply_patch(before, data['patch'], Consultation.EDITABLE_FIELDS)
+    except PatchTestFailed as e:
+        return jsonify({'error': str(e), 'current_version': consultation.version}), 409
+    except DeltaError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if after['prognosis'] and len(after['prognosis']) > 50:
+        return jsonify({'error': 'prognosis must be at most 50 characters'}), 400
+
+    if after == before:
+        return jsonify({'version': consultation.version}), 200
+
+    # Only changed columns end up in the UPDATE
+    for field, value in after.items():
+        if value != before[field]:
+            setattr(consultation, field, value)
+
+    try:
+        db.session.flush()
+    except StaleDataError:
+        db.session.rollback()
+        current = db.session.query(Consultation.version).filter_by(id=consultation_id).scalar()
+        return jsonify({'error': 'Version conflict', 'current_version': current}), 409
+
+    ConsultationRevisionService(db.session).record(
+        consultation, before, data['version'], get_jwt_identity(), fold=True
+    )
+
+    version = consultation.version
+    updated_at = consultation.updated_at
+    db.session.commit()
+
+    return jsonify({
+        'version': version,
+        'updated_at': updated_at.isoformat() if updated_at else None
+    }), 200
+
+@consultations_bp.route('/<consultation_id>/revisions', methods=['GET'])
+@jwt_required()
+def get_consultation_revisions(consultation_id):
+    """List the revision history of a consultation, newest first"""
+    from models.exam import ConsultationRevision
+    from models.user import User
+    from extensions import db
+
+    consultation, error = _get_accessible_consultation(consultation_id)
+    if error:
+        return error
+
+    rows = db.session.query(ConsultationRevision, User.name).outerjoin(
+        User, User.id == ConsultationRevision.created_by
+    ).filter(
+        ConsultationRevision.consultation_id == consultation.id
+    ).order_by(ConsultationRevision.version.desc()).all()
+
+    revisions = []
+    for revision, author_name in rows:
+        item = revision.to_dict()
+        item['author_name'] = author_name
+        revisions.append(item)
+
+    return jsonify({
+        'current_version': consultation.version,
+        'revisions': revisions
+    }), 200
+
+@consultations_bp.route('/<consultation_id>/revisions/<int:version>', methods=['GET'])
+@jwt_required()
+def get_consultation_revision(consultation_id, version):
+    """Reconstruct the consultation's text fields at a given version"""
+    from services.consultation_revisions import ConsultationRevisionService
+    from extensions import db
 
-    consultations = query.order_by(Appointment.datetime.desc()).limit(limit).all()
+    consultation, error = _get_accessible_consultation(consultation_id)
+    if error:
+        return error
+
+    result = ConsultationRevisionService(db.session).values_at(consultation, version)
+    if result is None:
+        return jsonify({'error': 'Version not found'}), 404
+
+    values, resolved = result
+    return jsonify({
+        'requested_version': version,
+        'version': resolved,
+        'current_version': consultation.version,
+        'values': values
+    }), 200
+
+@consultations_bp.route('/<consultation_id>/revisions/as-of', methods=['GET'])
+@jwt_required()
+def get_consultation_as_of(consultation_id):
+    """Reconstruct the consultation's text fields as they were at a point in time"""
+    from services.consultation_revisions import ConsultationRevisionService
+    from extensions import db
+    from datetime import datetime, timezone
+
+    try:
+        moment = datetime.fromisoformat(request.args.get('at', '').replace('Z', '+00:00'))
+    except ValueError:
+        return jsonify({'error': 'at must be an ISO 8601 timestamp'}), 400
+
+    # Timestamps are stored as naive UTC
+    if moment.tzinfo:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+    consultation, error = _get_accessible_consultation(consultation_id)
+    if error:
+        return error
+
+    service = ConsultationRevisionService(db.session)
+    version = service.version_at(consultation, moment)
+    result = service.values_at(consultation, version) if version else None
+    if result is None:
+        return jsonify({'error': 'Consultation did not exist at that time'}), 404
+
+    values, resolved = result
+    return jsonify({
+        'at': moment.isoformat(),
+        'version': resolved,
+        'current_version': consultation.version,
+        'values': values
+    }), 200
+
+@consultations_bp.route('/exam-results/<exam_id>/lab-values', methods=['PUT'])
+@jwt_required()
+def replace_lab_values(exam_id):
+    """Replace the structured lab values of an exam result"""
+    from models.exam import ExamResult, ExamLabValue
+    from extensions import db
+    from services.authorization import current_claims, can_access_clinic
+
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
+
+    data = request.get_json()
+
+    if not data or not isinstance(data.get('lab_values'), list):
+        return jsonify({'error': 'lab_values must be a list'}), 400
+
+    try:
+        lab_values = [ExamLabValue.from_payload(item) for item in data['lab_values']]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    exam_result = ExamResult.query.get(exam_id)
+
+    if not exam_result:
+        return jsonify({'error': 'Exam result not found'}), 404
+
+    if not can_access_clinic(claims, exam_result.consultation.appointment.clinic_id):
+        return jsonify({'error': 'Access denied'}), 403
+
+    exam_result.lab_values = lab_values
+    db.session.flush()
+
+    result = [value.to_dict() for value in exam_result.lab_values]
+    db.session.commit()
+
+    return jsonify({'lab_values': result}), 200
+
+@consultations_bp.route('/exam-results/<exam_id>/accesses', methods=['GET'])
+@jwt_required()
+def get_exam_accesses(exam_id):
+    """Portal access history of an exam result, newest first (?before=<id>, ?limit=)"""
+    from models.exam import ExamResult, ExamAccessEvent
+    from services.authorization import current_claims, can_access_clinic
+
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
+
+    before = request.args.get('before', type=int)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+
+    exam_result = ExamResult.query.get(exam_id)
+
+    if not exam_result:
+        return jsonify({'error': 'Exam result not found'}), 404
+
+    if not can_access_clinic(claims, exam_result.consultation.appointment.clinic_id):
+        return jsonify({'error': 'Access denied'}), 403
+
+    query = ExamAccessEvent.query.filter(ExamAccessEvent.exam_result_id == exam_result.id)
+    if before:
+        query = query.filter(ExamAccessEvent.id < before)
+
+    events = query.order_by(ExamAccessEvent.id.desc()).limit(limit + 1).all()
+    has_more = len(events) > limit
+    events = events[:limit]
 
     return jsonify({
-        'consultations': [{
-            'id': str(c.id),
-            'appointment_id': str(c.appointment_id),
-            'chief_complaint': c.chief_complaint,
-            'diagnosis': c.diagnosis,
-            'treatment_plan': c.treatment_plan,
-            'prognosis': c.prognosis,
-            'created_at': c.created_at.isoformat(),
-            'appointment': {
-                'datetime': c.appointment.datetime.isoformat(),
-                'service_type': c.appointment.service_type,
-                'animal': {
-                    'id': str(c.appointment.animal.id),
-                    'name': c.appointment.animal.name,
-                    'species': c.appointment.animal.species,
-                    'tutor': {
-                        'name': c.appointment.animal.tutor.name
-                    }
-                }
+        'last_accessed': exam_result.last_accessed.isoformat() if exam_result.last_accessed else None,
+        'view_count': exam_result.view_count or 0,
+        'accesses': [event.to_dict() for event in events],
+        'next_before': events[-1].id if has_more else None
+    }), 200
+
+@consultations_bp.route('/lab-values', methods=['GET'])
+@jwt_required()
+def query_lab_values():
+    """
+    Range query over structured lab values
+    e.g. ?analyte=creatinine&species=felino&min=2.0&from=2026-01-01
+    """
+    from models.exam import Consultation, ExamResult, ExamLabValue
+    from models.appointment import Appointment
+    from models.patient import Animal
+    from extensions import db
+    from services.authorization import current_claims
+    from datetime import datetime
+    from decimal import Decimal, InvalidOperation
+    from sqlalchemy import func
+
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
+
+    analyte = ExamLabValue.normalize_analyte(request.args.get('analyte'))
+    species = request.args.get('species', '').strip()
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+
+    if not analyte:
+        return jsonify({'error': 'analyte required'}), 400
+
+    try:
+        min_value = Decimal(request.args['min']) if request.args.get('min') else None
+        max_value = Decimal(request.args['max']) if request.args.get('max') else None
+    except InvalidOperation:
+        return jsonify({'error': 'min and max must be numbers'}), 400
+
+    try:
+        date_from = datetime.fromisoformat(request.args['from']).date() if request.args.get('from') else None
+        date_to = datetime.fromisoformat(request.args['to']).date() if request.args.get('to') else None
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO dates'}), 400
+
+    query = db.session.query(
+        ExamLabValue,
+        ExamResult.exam_type,
+        ExamResult.exam_date,
+        Animal.id.label('animal_id'),
+        Animal.name.label('animal_name'),
+        Animal.species
+    ).join(
+        ExamResult, ExamResult.id == ExamLabValue.exam_result_id
+    ).join(
+        Animal, Animal.id == ExamResult.animal_id
+    ).filter(ExamLabValue.analyte == analyte)
+
+    if min_value is not None:
+        query = query.filter(ExamLabValue.value >= min_value)
+    if max_value is not None:
+        query = query.filter(ExamLabValue.value <= max_value)
+    if date_from:
+        query = query.filter(ExamResult.exam_date >= date_from)
+    if date_to:
+        query = query.filter(ExamResult.exam_date <= date_to)
+    if species:
+        query = query.filter(func.lower(Animal.species) == species.lower())
+
+    if not claims.get('is_dr_saulo'):
+        query = query.join(
+            Consultation, Consultation.id == ExamResult.consultation_id
+        ).join(
+            Appointment, Appointment.id == Consultation.appointment_id
+        ).filter(Appointment.clinic_id == claims.get('clinic_id'))
+
+    rows = query.order_by(ExamResult.exam_date.desc(), ExamLabValue.value.desc()).limit(limit).all()
+
+    return jsonify({
+        'results': [{
+            **row.ExamLabValue.to_dict(),
+            'exam_result_id': str(row.ExamLabValue.exam_result_id),
+            'exam_type': row.exam_type,
+            'exam_date': row.exam_date.isoformat(),
+            'animal': {
+                'id': str(row.animal_id),
+                'name': row.animal_name,
+                'species': row.species
             }
-        } for c in consultations]
+        } for row in rows]
+    }), 200
+
+@consultations_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_clinical_notes():
+    """
+    Ranked full-text search over consultation notes and exam results
+    Uses the generated search_vector columns (GIN indexed)
+    """
+    from models.exam import Consultation, ExamResult, clinical_tsquery, clinical_headline
+    from models.appointment import Appointment
+    from models.patient import Animal, Tutor
+    from extensions import db
+    from services.authorization import current_claims
+    from sqlalchemy import func
+
+    claims = current_claims()
+
+    if not claims:
+        return jsonify({'error': 'Access denied'}), 403
+
+    term = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    if not term:
+        return jsonify({'error': 'q parameter required'}), 400
+
+    tsquery = clinical_tsquery(term)
+
+    # Rank over the index first, build headlines only for the top rows
+    consultation_rank = func.ts_rank_cd(Consultation.search_vector, tsquery)
+    top_consultations = db.session.query(
+        Consultation.id.label('id'),
+        consultation_rank.label('rank')
+    ).filter(
+        Consultation.search_vector.op('@@')(tsquery)
+    )
+    # Scope before ranking so the limit applies to the caller's clinic
+    if not claims.get('is_dr_saulo'):
+        top_consultations = top_consultations.join(
+            Appointment, Appointment.id == Consultation.appointment_id
+        ).filter(Appointment.clinic_id == claims.get('clinic_id'))
+    top_consultations = top_consultations.order_by(consultation_rank.desc()).limit(limit).subquery()
+
+    consultation_rows = db.session.query(
+        Consultation.id,
+        Consultation.diagnosis,
+        Consultation.chief_complaint,
+        Appointment.datetime,
+        Animal.id.label('animal_id'),
+        Animal.name.label('animal_name'),
+        Tutor.name.label('tutor_name'),
+        top_consultations.c.rank,
+        clinical_headline(
+            func.concat_ws(' … ', Consultation.diagnosis, Consultation.chief_complaint,
+                           Consultation.physical_exam, Consultation.treatment_plan, Consultation.notes),
+            tsquery
+        ).label('snippet')
+    ).join(top_consultations, top_consultations.c.id == Consultation.id
+    ).join(Appointment, Consultation.appointment_id == Appointment.id
+    ).join(Animal, Appointment.animal_id == Animal.id
+    ).join(Tutor, Animal.tutor_id == Tutor.id).all()
+
+    exam_rank = func.ts_rank_cd(ExamResult.search_vector, tsquery)
+    top_exams = db.session.query(
+        ExamResult.id.label('id'),
+        exam_rank.label('rank')
+    ).filter(
+        ExamResult.search_vector.op('@@')(tsquery)
+    )
+    if not claims.get('is_dr_saulo'):
+        top_exams = top_exams.join(
+            Consultation, Consultation.id == ExamResult.consultation_id
+        ).join(
+            Appointment, Appointment.id == Consultation.appointment_id
+        ).filter(Appointment.clinic_id == claims.get('clinic_id'))
+    top_exams = top_exams.order_by(exam_rank.desc()).limit(limit).subquery()
+
+    exam_rows = db.session.query(
+        ExamResult.id,
+        ExamResult.consultation_id,
+        ExamResult.exam_type,
+        ExamResult.exam_date,
+        Animal.id.label('animal_id'),
+        Animal.name.label('animal_name'),
+        Tutor.name.label('tutor_name'),
+        top_exams.c.rank,
+        clinical_headline(
+            func.concat_ws(' … ', ExamResult.impression, ExamResult.findings),
+            tsquery
+        ).label('snippet')
+    ).join(top_exams, top_exams.c.id == ExamResult.id
+    ).join(Animal, ExamResult.animal_id == Animal.id
+    ).join(Tutor, Animal.tutor_id == Tutor.id).all()
+
+    results = [{
+        'type': 'consultation',
+        'id': str(row.id),
+        'rank': float(row.rank),
+        'snippet': row.snippet,
+        'diagnosis': row.diagnosis,
+        'chief_complaint': row.chief_complaint,
+        'datetime': row.datetime.isoformat(),
+        'animal': {
+            'id': str(row.animal_id),
+            'name': row.animal_name,
+            'tutor': {'name': row.tutor_name}
+        }
+    } for row in consultation_rows] + [{
+        'type': 'exam_result',
+        'id': str(row.id),
+        'rank': float(row.rank),
+        'snippet': row.snippet,
+        'consultation_id': str(row.consultation_id),
+        'exam_type': row.exam_type,
+        'exam_date': row.exam_date.isoformat(),
+        'animal': {
+            'id': str(row.animal_id),
+            'name': row.animal_name,
+            'tutor': {'name': row.tutor_name}
+        }
+    } for row in exam_rows]
+
+    results.sort(key=lambda r: r['rank'], reverse=True)
+
+    return jsonify({
+        'query': term,
+        'results': results[:limit]
     }), 200
 
 @consultations_bp.route('/<consultation_id>', methods=['GET'])
@@ -62,40 +712,9 @@ def get_consultations():
 def get_consultation(consultation_id):
     from models.exam import Consultation
 
-    consultation = Consultation.query.get(consultation_id)
+    consultation = Consultation.load_detail(consultation_id)
 
     if not consultation:
         return jsonify({'error': 'Consultation not found'}), 404
 
-    return jsonify({
-        'consultation': {
-            'id': str(consultation.id),
-            'appointment_id': str(consultation.appointment_id),
-            'chief_complaint': consultation.chief_complaint,
-            'physical_exam': consultation.physical_exam,
-            'diagnosis': consultation.diagnosis,
-            'prognosis': consultation.prognosis,
-            'treatment_plan': consultation.treatment_plan,
-            'notes': consultation.notes,
-            'created_at': consultation.created_at.isoformat(),
-            'appointment': {
-                'datetime': consultation.appointment.datetime.isoformat(),
-                'service_type': consultation.appointment.service_type,
-                'status': consultation.appointment.status,
-                'animal': {
-                    'id': str(consultation.appointment.animal.id),
-                    'name': consultation.appointment.animal.name,
-                    'species': consultation.appointment.animal.species,
-                    'breed': consultation.appointment.animal.breed,
-                    'age_years': consultation.appointment.animal.to_dict().get('age_years'),
-                    'sex': consultation.appointment.animal.sex,
-                    'weight': float(consultation.appointment.animal.weight) if consultation.appointment.animal.weight else None,
-                    'tutor': {
-                        'name': consultation.appointment.animal.tutor.name,
-                        'phone': consultation.appointment.animal.tutor.phone,
-                        'email': consultation.appointment.animal.tutor.email
-                    }
-                }
-            }
-        }
-    }), 200
+    return jsonify({'consultation': consultation.to_detail_dict()}), 200
@@ -3,6 +3,22 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 patients_bp = Blueprint('patients', __name__, url_prefix='/api/patients')
 
+def _apply_name_search(query, text_match, search, *phonetic_columns):
+    """
+    Filter by the text match plus a phonetic tier for misspelled names
+    Text matches are ordered first, phonetic-only matches after them
+    """
+    from sqlalchemy import case, or_
+    from utils.phonetic import phonetic_tokens
+
+    codes = phonetic_tokens(search)
+    if not codes:
+        # No letters in the search (e.g. a CPF), nothing to match phonetically
+        return query.filter(text_match)
+
+    phonetic_match = or_(*[column.contains(codes) for column in phonetic_columns])
+    return query.filter(text_match | phonetic_match).order_by(case((text_match, 0), else_=1))
+
 @patients_bp.route('/tutors', methods=['GET'])
 @jwt_required()
 def get_tutors():
@@ -15,9 +31,12 @@ def get_tutors():
     query = Tutor.query
 
     if search:
-        query = query.filter(
+        query = _apply_name_search(
+            query,
             (Tutor.name.ilike(f'%{search}%')) |
-            (Tutor.cpf.ilike(f'%{search}%'))
+            (Tutor.cpf.ilike(f'%{search}%')),
+            search,
+            Tutor.name_phonetic
         )
 
     paginated = query.order_by(Tutor.name).paginate(
@@ -44,7 +63,7 @@ def create_tutor():
         return jsonify({'error': 'Missing required fields'}), 400
 
     # Check if CPF already exists
-    existing = Tutor.query.filter_by(cpf=data['cpf']).first()
+    existing = Tutor.find_by_cpf(data['cpf'])
     if existing:
         return jsonify({'error': 'CPF already registered'}), 409
 
@@ -86,7 +105,7 @@ def get_animals():
     query = Animal.query
 
     if search:
-        query = query.filter(Animal.name.ilike(f'%{search}%'))
+        query = _apply_name_search(query, Animal.name.ilike(f'%{search}%'), search, Animal.name_phonetic)
 
     if tutor_id:
         query = query.filter_by(tutor_id=tutor_id)
@@ -231,6 +250,147 @@ def get_animal_consultations(animal_id):
         } for c in consultations]
     }), 200
 
+@patients_bp.route('/animals/<animal_id>/exams', methods=['GET'])
+@jwt_required()
+def get_animal_exams(animal_id):
+    """
+    Exam results of an animal, newest first, paginated by cursor
+    Only summary columns are loaded unless ?full=true
+    """
+    from models.patient import Animal
+    from models.exam import ExamResult
+    from utils.pagination import encode_cursor, decode_cursor
+    from extensions import db
+    from sqlalchemy import tuple_
+    from sqlalchemy.orm import load_only, selectinload
+
+    cursor = request.args.get('cursor')
+    full = request.args.get('full', 'false').lower() == 'true'
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    if not db.session.query(Animal.id).filter_by(id=animal_id).first():
+        return jsonify({'error': 'Animal not found'}), 404
+
+    query = ExamResult.query.filter(ExamResult.animal_id == animal_id)
+
+    if full:
+        query = query.options(selectinload(ExamResult.images))
+    else:
+        query = query.options(load_only(*(getattr(ExamResult, column) for column in ExamResult.SUMMARY_COLUMNS)))
+
+    if cursor:
+        try:
+            after_date, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        query = query.filter(tuple_(ExamResult.exam_date, ExamResult.id) < tuple_(after_date.date(), after_id))
+
+    # One extra row tells whether another page exists
+    exams = query.order_by(ExamResult.exam_date.desc(), ExamResult.id.desc()).limit(limit + 1).all()
+    has_more = len(exams) > limit
+    exams = exams[:limit]
+
+    next_cursor = encode_cursor(exams[-1].exam_date, exams[-1].id) if has_more else None
+
+    return jsonify({
+        'exams': [exam.to_dict() if full else exam.to_summary_dict() for exam in exams],
+        'next_cursor': next_cursor
+    }), 200
+
+@patients_bp.route('/animals/<animal_id>/exams/<exam_id>', methods=['GET'])
+@jwt_required()
+def get_animal_exam(animal_id, exam_id):
+    """Full text of a single exam result, fetched on demand"""
+    from models.exam import ExamResult
+    from sqlalchemy.orm import selectinload
+
+    exam = ExamResult.query.options(
+        selectinload(ExamResult.lab_values), selectinload(ExamResult.images)
+    ).filter_by(
+        id=exam_id, animal_id=animal_id
+    ).first()
+
+    if not exam:
+        return jsonify({'error': 'Exam result not found'}), 404
+
+    result = exam.to_dict()
+    result['consultation_id'] = str(exam.consultation_id)
+    result['lab_values'] = [value.to_dict() for value in exam.lab_values]
+
+    return jsonify({'exam': result}), 200
+
+@patients_bp.route('/animals/<animal_id>/exams/<exam_id>/images', methods=['GET'])
+@jwt_required()
+def get_animal_exam_images(animal_id, exam_id):
+    """Image metadata of an exam result, paginated by position (?after=, ?limit=)"""
+    from models.exam import ExamResult, ExamImage
+    from extensions import db
+
+    after = request.args.get('after', -1, type=int)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    if not db.session.query(ExamResult.id).filter_by(id=exam_id, animal_id=animal_id).first():
+        return jsonify({'error': 'Exam result not found'}), 404
+
+    images = ExamImage.query.filter(
+        ExamImage.exam_result_id == exam_id,
+        ExamImage.position > after
+    ).order_by(ExamImage.position).limit(limit + 1).all()
+
+    has_more = len(images) > limit
+    images = images[:limit]
+
+    return jsonify({
+        'images': [image.to_dict() for image in images],
+        'next_after': images[-1].position if has_more else None
+    }), 200
+
+@patients_bp.route('/animals/<animal_id>/exams/<exam_id>/images/<image_id>', methods=['GET'])
+@jwt_required()
+def get_animal_exam_image(animal_id, exam_id, image_id):
+    from models.exam import ExamResult, ExamImage
+
+    image = ExamImage.query.join(
+        ExamResult, ExamResult.id == ExamImage.exam_result_id
+    ).filter(
+        ExamImage.id == image_id,
+        ExamImage.exam_result_id == exam_id,
+        ExamResult.animal_id == animal_id
+    ).first()
+
+    if not image:
+        return jsonify({'error': 'Image not found'}), 404
+
+    return jsonify({'image': image.to_dict()}), 200
+
+@patients_bp.route('/animals/<animal_id>/weights', methods=['GET'])
+@jwt_required()
+def get_animal_weights(animal_id):
+    """Weight series for charts, downsampled server-side (?points=, ?from=, ?to=)"""
+    from models.patient import Animal
+    from services.weight_history import WeightHistoryService, DEFAULT_SERIES_POINTS
+    from extensions import db
+    from datetime import datetime
+
+    points = min(max(request.args.get('points', DEFAULT_SERIES_POINTS, type=int), 3), 1000)
+
+    try:
+        date_from = datetime.fromisoformat(request.args['from']) if request.args.get('from') else None
+        date_to = datetime.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({'error': 'from and to must be ISO dates'}), 400
+
+    if not db.session.query(Animal.id).filter_by(id=animal_id).first():
+        return jsonify({'error': 'Animal not found'}), 404
+
+    total, series = WeightHistoryService(db.session).series(animal_id, points, date_from, date_to)
+
+    return jsonify({
+        'animal_id': animal_id,
+        'total_measurements': total,
+        'points': [{'measured_at': measured_at.isoformat(), 'weight': weight} for measured_at, weight in series]
+    }), 200
+
 @patients_bp.route('', methods=['GET'])
 @patients_bp.route('/', methods=['GET'])
 @jwt_required()
@@ -245,10 +405,14 @@ def get_patients():
     query = Animal.query.options(joinedload(Animal.tutor))
 
     if search:
-        query = query.join(Tutor).filter(
+        query = _apply_name_search(
+            query.join(Tutor),
             (Animal.name.ilike(f'%{search}%')) |
             (Tutor.name.ilike(f'%{search}%')) |
-            (Tutor.cpf.ilike(f'%{search}%'))
+            (Tutor.cpf.ilike(f'%{search}%')),
+            search,
+            Animal.name_phonetic,
+            Tutor.name_phonetic
         )
 
     patients = query.order_by(Animal.name).limit(limit).all()
@@ -282,8 +446,8 @@ def create_patient():
     if not all(field in animal_data for field in ['name', 'species', 'sex']):
         return jsonify({'error': 'Missing required animal fields'}), 400
 
-    # Check if tutor already exists by CPF
-    tutor = Tutor.query.filter_by(cpf=tutor_data['cpf']).first()
+    # Check if tutor already exists by CPF (any formatting)
+    tutor = Tutor.find_by_cpf(tutor_data['cpf'])
 
     if not tutor:
         # Create new tutor
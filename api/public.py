@@ -1,78 +1,269 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime
+from flask import Blueprint, request, jsonify, current_app
+from extensions import rate_limiter
+from utils.portal import RESULTS_TOKEN_MAX_AGE, RESULTS_CACHE_MAX_AGE, portal_credentials, result_etag
 
 public_bp = Blueprint('public', __name__, url_prefix='/api/public')
 
+def _portal_query(*columns):
+    """
+    Exam results joined to their animal and tutor, for matching access code and CPF
+    in a single indexed lookup (access_code unique, tutors.cpf_digits indexed)
+    """
+    from models.exam import ExamResult
+    from models.patient import Animal, Tutor
+    from extensions import db
+
+    return db.session.query(*columns).select_from(ExamResult).join(
+        Animal, Animal.id == ExamResult.animal_id
+    ).join(
+        Tutor, Tutor.id == Animal.tutor_id
+    )
+
+def _load_document(*criteria):
+    """Load one result with animal, tutor name and image URLs in a single statement"""
+    from models.exam import ExamResult, ExamImage
+    from models.patient import Tutor
+    from sqlalchemy import select, func
+    from sqlalchemy.orm import contains_eager
+    from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+    # Image URLs come back in the same round trip
+    images_url = select(
+        func.array_agg(aggregate_order_by(ExamImage.url, ExamImage.position))
+    ).where(ExamImage.exam_result_id == ExamResult.id).scalar_subquery()
+
+    return _portal_query(
+        ExamResult, Tutor.name.label('tutor_name'), images_url.label('images_url')
+    ).options(
+        contains_eager(ExamResult.animal)
+    ).filter(*criteria).first()
+
+def _document(row):
+    return {
+        'result': row.ExamResult.to_public_dict(include_animal=True, images_url=row.images_url or []),
+        'tutor': {
+            'name': row.tutor_name
+        }
+    }
+
+def _cached_response(entry):
+    return current_app.response_class(entry['body'], status=entry['status'], mimetype='application/json')
+
+def _token_secret():
+    return current_app.config.get('SECRET_KEY') or current_app.config['JWT_SECRET_KEY']
+
+def _token_serializer():
+    from utils.portal import token_serializer
+
+    return token_serializer(_token_secret())
+
+def _record_access(exam_result_id):
+    from extensions import access_events
+
+    # Read-only request: the access is recorded write-behind
+    access_events.record(exam_result_id, request.remote_addr, request.headers.get('User-Agent'))
+
 @public_bp.route('/results', methods=['POST'])
+@rate_limiter.limit('portal')
 def get_results():
     """
     Public endpoint to access exam results
     Requires CPF and access code
+    The response carries a signed token for the cacheable GET /results/<token>
     """
     from models.exam import ExamResult
     from models.patient import Tutor
-    from extensions import db
+    from extensions import access_codes, result_cache
 
     data = request.get_json()
 
     if not data or not data.get('cpf') or not data.get('access_code'):
         return jsonify({'error': 'CPF and access code required'}), 400
 
-    cpf = data['cpf'].replace('.', '').replace('-', '')  # Normalize CPF
-    access_code = data['access_code'].upper().strip()
+    access_code, cpf = portal_credentials(data)
+
+    # Repeat visits are served from the per-worker cache
+    cached = result_cache.get(access_code, cpf)
+    if cached:
+        if cached['exam_result_id']:
+            _record_access(cached['exam_result_id'])
+        return _cached_response(cached)
+
+    # Mistyped and guessed codes are rejected without touching the database
+    if not access_codes.might_exist(access_code):
+        return jsonify({'error': 'Invalid credentials'}), 401
+
+    row = _load_document(ExamResult.access_code == access_code, Tutor.cpf_digits == cpf)
+
+    # Same answer for a wrong code or a wrong CPF
+    if not row:
+        body = current_app.json.dumps({'error': 'Invalid credentials'})
+        return _cached_response(result_cache.store(access_code, cpf, 401, body))
+
+    exam_result = row.ExamResult
+    _record_access(exam_result.id)
+
+    document = _document(row)
+    document['token'] = _token_serializer().dumps({'e': str(exam_result.id)})
+    document['token_expires_in'] = RESULTS_TOKEN_MAX_AGE
 
-    # Find the exam result by access code
-    exam_result = ExamResult.query.filter_by(access_code=access_code).first()
+    body = current_app.json.dumps(document)
+    entry = result_cache.store(access_code, cpf, 200, body, exam_result.id, exam_result.exam_type)
 
-    if not exam_result:
-        return jsonify({'error': 'Invalid access code'}), 404
+    return _cached_response(entry)
 
-    # Verify CPF matches the animal's tutor
-    if not exam_result.animal or not exam_result.animal.tutor:
+@public_bp.route('/results/<token>', methods=['GET'])
+@rate_limiter.limit('portal-token')
+def get_results_by_token(token):
+    """
+    Cacheable variant of POST /results, authorised by the token it issued
+    Answers 304 when If-None-Match carries the current ETag
+    """
+    from models.exam import ExamResult
+    from extensions import db
+    from utils.portal import read_token, result_stamp_sql
+    from sqlalchemy import text
+
+    payload = read_token(_token_secret(), token)
+    if not payload or not payload.get('e'):
+        return jsonify({'error': 'Invalid or expired token'}), 401
+
+    # Version stamp only: result, animal, tutor and images in one indexed lookup
+    stamp = db.session.execute(text(result_stamp_sql(':id')), {'id': payload['e']}).first()
+
+    if not stamp:
         return jsonify({'error': 'Result not found'}), 404
 
-    tutor_cpf = exam_result.animal.tutor.cpf.replace('.', '').replace('-', '')
+    etag = result_etag(stamp.id, stamp.stamp, stamp.image_count)
+    _record_access(stamp.id)
 
-    if tutor_cpf != cpf:
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        row = _load_document(ExamResult.id == stamp.id)
+        if not row:
+            return jsonify({'error': 'Result not found'}), 404
+        response = current_app.response_class(
+            current_app.json.dumps(_document(row)), status=200, mimetype='application/json'
+        )
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = RESULTS_CACHE_MAX_AGE
+    response.vary.add('Origin')
+    return response
+
+@public_bp.route('/inbox', methods=['POST'])
+@rate_limiter.limit('portal')
+def get_inbox():
+    """
+    All exam results of the tutor who owns the given access code
+    Requires CPF and any one of the tutor's access codes; paginated by cursor
+    Each item carries a token for GET /results/<token>
+    """
+    from models.exam import ExamResult
+    from models.patient import Animal, Tutor
+    from extensions import access_codes
+    from utils.pagination import encode_cursor, decode_cursor
+    from sqlalchemy import exists, tuple_
+    from sqlalchemy.orm import aliased
+
+    data = request.get_json()
+
+    if not data or not data.get('cpf') or not data.get('access_code'):
+        return jsonify({'error': 'CPF and access code required'}), 400
+
+    access_code, cpf = portal_credentials(data)
+    cursor = data.get('cursor')
+    try:
+        limit = min(max(int(data.get('limit', 20)), 1), 100)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'limit must be a number'}), 400
+
+    if not access_codes.might_exist(access_code):
         return jsonify({'error': 'Invalid credentials'}), 401
 
-    # Update last accessed timestamp
-    exam_result.last_accessed = datetime.utcnow()
-    db.session.commit()
+    # Verification and listing in one statement: the code must belong to the same tutor
+    code_exam = aliased(ExamResult)
+    code_animal = aliased(Animal)
+    owns_code = exists().where(
+        code_exam.access_code == access_code,
+        code_animal.id == code_exam.animal_id,
+        code_animal.tutor_id == Tutor.id
+    )
+
+    query = _portal_query(
+        ExamResult.id,
+        ExamResult.exam_type,
+        ExamResult.exam_date,
+        Animal.name.label('animal_name'),
+        Animal.species.label('animal_species')
+    ).filter(Tutor.cpf_digits == cpf, owns_code)
+
+    if cursor:
+        try:
+            after_date, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        query = query.filter(tuple_(ExamResult.exam_date, ExamResult.id) < tuple_(after_date.date(), after_id))
+
+    rows = query.order_by(ExamResult.exam_date.desc(), ExamResult.id.desc()).limit(limit + 1).all()
+
+    # Same answer for a wrong code or a wrong CPF
+    if not rows and not cursor:
+        return jsonify({'error': 'Invalid credentials'}), 401
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    serializer = _token_serializer()
 
-    # Return public result
     return jsonify({
-        'result': exam_result.to_public_dict(include_animal=True),
-        'tutor': {
-            'name': exam_result.animal.tutor.name
-        }
+        'results': [{
+            'exam_type': row.exam_type,
+            'exam_date': row.exam_date.isoformat(),
+            'animal': {
+                'name': row.animal_name,
+                'species': row.animal_species
+            },
+            'token': serializer.dumps({'e': str(row.id)})
+        } for row in rows],
+        'token_expires_in': RESULTS_TOKEN_MAX_AGE,
+        'next_cursor': encode_cursor(rows[-1].exam_date, rows[-1].id) if has_more else None
     }), 200
 
 @public_bp.route('/results/verify', methods=['POST'])
+@rate_limiter.limit('portal')
 def verify_access():
     """
     Verify if CPF and access code combination exists
     """
     from models.exam import ExamResult
     from models.patient import Tutor
+    from extensions import access_codes, result_cache
 
     data = request.get_json()
 
     if not data or not data.get('cpf') or not data.get('access_code'):
         return jsonify({'error': 'CPF and access code required'}), 400
 
-    cpf = data['cpf'].replace('.', '').replace('-', '')
-    access_code = data['access_code'].upper().strip()
+    access_code, cpf = portal_credentials(data)
 
-    # Find the exam result
-    exam_result = ExamResult.query.filter_by(access_code=access_code).first()
+    cached = result_cache.get(access_code, cpf)
+    if cached:
+        return jsonify({
+            'valid': cached['status'] == 200,
+            'exam_type': cached['exam_type']
+        }), 200
 
-    if not exam_result or not exam_result.animal or not exam_result.animal.tutor:
-        return jsonify({'valid': False}), 200
+    if not access_codes.might_exist(access_code):
+        return jsonify({'valid': False, 'exam_type': None}), 200
 
-    tutor_cpf = exam_result.animal.tutor.cpf.replace('.', '').replace('-', '')
+    exam_type = _portal_query(ExamResult.exam_type).filter(
+        ExamResult.access_code == access_code,
+        Tutor.cpf_digits == cpf
+    ).scalar()
 
     return jsonify({
-        'valid': tutor_cpf == cpf,
-        'exam_type': exam_result.exam_type if tutor_cpf == cpf else None
+        'valid': exam_type is not None,
+        'exam_type': exam_type
     }), 200
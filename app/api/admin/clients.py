@@ -95,7 +95,7 @@ def create_client():
                 return {'error': f'{field} is required'}, 400
 
         # Check if CPF already exists
-        if Tutor.query.filter_by(cpf=data['cpf']).first():
+        if Tutor.find_by_cpf(data['cpf']):
             return {'error': 'A client with this CPF already exists'}, 400
 
         # Check if email already exists (if provided)
@@ -247,7 +247,7 @@ def update_client(client_id):
             tutor.phone = data['phone']
         if 'cpf' in data:
             # Check if CPF already exists for another tutor
-            existing = Tutor.query.filter(Tutor.cpf == data['cpf'], Tutor.id != client_id).first()
+            existing = Tutor.find_by_cpf(data['cpf'], exclude_id=client_id)
             if existing:
                 return {'error': 'Another client with this CPF already exists'}, 400
             tutor.cpf = data['cpf']
@@ -318,4 +318,57 @@ def add_client_animal(client_id):
 
     except Exception as e:
         db.session.rollback()
-        return {'error': 'Failed to add animal', 'details': str(e)}, 500
\ No newline at end of file
+        return {'error': 'Failed to add animal', 'details': str(e)}, 500
+
+@admin_bp.route('/clients/duplicates', methods=['GET'])
+@admin_required
+def get_duplicate_clients():
+    """Find likely duplicate clients (tutors) by normalized CPF, phone, email and name"""
+    try:
+        from services.tutor_dedupe import TutorDeduplicationService
+
+        threshold = request.args.get('threshold', 0.5, type=float)
+        limit = request.args.get('limit', 100, type=int)
+
+        candidates = TutorDeduplicationService(db.session).find_candidates(
+            threshold=threshold,
+            limit=limit
+        )
+
+        return jsonify({
+            'candidates': candidates,
+            'total': len(candidates)
+        }), 200
+
+    except Exception as e:
+        return {'error': 'Failed to find duplicate clients', 'details': str(e)}, 500
+
+@admin_bp.route('/clients/<client_id>/merge', methods=['POST'])
+@admin_required
+def merge_clients(client_id):
+    """Merge duplicate clients into this one, moving their animals"""
+    try:
+        from services.tutor_dedupe import TutorDeduplicationService
+
+        data = request.get_json()
+
+        if not data or not data.get('source_ids'):
+            return {'error': 'source_ids is required'}, 400
+
+        try:
+            moved = TutorDeduplicationService(db.session).merge(client_id, data['source_ids'])
+        except LookupError as e:
+            return {'error': str(e)}, 404
+
+        db.session.commit()
+
+        return {
+            'message': 'Clients merged successfully',
+            'client_id': client_id,
+            'merged': len(data['source_ids']),
+            'animals_moved': moved
+        }, 200
+
+    except Exception as e:
+        db.session.rollback()
+        return {'error': 'Failed to merge clients', 'details': str(e)}, 500
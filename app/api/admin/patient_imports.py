@@ -0,0 +1,50 @@
+from flask import request, jsonify
+from extensions import db
+import codecs
+import io
+from . import admin_bp, admin_required
+
+@admin_bp.route('/imports/patients', methods=['POST'])
+@admin_required
+def import_patients():
+    """
+    Import legacy tutors and animals from a CSV spreadsheet
+    Valid rows are imported in one transaction; invalid rows are reported
+    """
+    try:
+        from services.patient_import import PatientImportService
+
+        if 'file' not in request.files:
+            return {'error': 'No file provided'}, 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return {'error': 'No file selected'}, 400
+
+        if not file.filename.lower().endswith('.csv'):
+            return {'error': 'Only CSV files are allowed'}, 400
+
+        encoding = request.form.get('encoding', 'utf-8-sig')
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            return {'error': f'Unknown encoding: {encoding}'}, 400
+
+        text_stream = io.TextIOWrapper(file.stream, encoding=encoding, newline='')
+
+        try:
+            report = PatientImportService(db.session).run(text_stream)
+        except (ValueError, UnicodeDecodeError) as e:
+            db.session.rollback()
+            return {'error': str(e)}, 400
+
+        db.session.commit()
+
+        return jsonify({
+            'message': f"Imported {report['valid_rows']} of {report['rows']} rows",
+            'report': report
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return {'error': 'Failed to import patients', 'details': str(e)}, 500
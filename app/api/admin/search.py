@@ -0,0 +1,35 @@
+from flask import request, jsonify
+from services.search_index import search, SOURCES
+from . import admin_bp, admin_required
+
+@admin_bp.route('/search', methods=['GET'])
+@admin_required
+def global_search():
+    """Search tutors, animals, users, clinics, consultations and exam access codes at once"""
+    try:
+        term = request.args.get('q', '').strip()
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        types = [t for t in request.args.get('types', '').split(',') if t]
+
+        if not term:
+            return {'error': 'q parameter is required'}, 400
+
+        invalid = [t for t in types if t not in SOURCES]
+        if invalid:
+            return {'error': f'Unknown types: {", ".join(invalid)}'}, 400
+
+        results = search(term, types=types or None, limit=limit)
+
+        return jsonify({
+            'query': term,
+            'results': [{
+                'type': row.entity_type,
+                'id': str(row.entity_id),
+                'title': row.title,
+                'subtitle': row.subtitle,
+                'rank': float(row.rank)
+            } for row in results]
+        }), 200
+
+    except Exception as e:
+        return {'error': 'Failed to search', 'details': str(e)}, 500
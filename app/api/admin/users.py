@@ -1,8 +1,8 @@
 from flask import request, jsonify
 from models.user import User
 from models.user import Clinic
-from extensions import db
-from werkzeug.security import generate_password_hash
+from extensions import db, password_hasher, user_status
+from services.password_hasher import PasswordHasherBusy
 import secrets
 from . import admin_bp, admin_required
 
@@ -107,7 +107,7 @@ def create_user():
             return {'error': 'Clinic not found'}, 404
 
         # Generate password hash
-        password_hash = generate_password_hash(data['password'])
+        password_hash = password_hasher.hash(data['password'])
 
         # Create new user (secretary by default)
         user = User(
@@ -137,6 +137,10 @@ def create_user():
             }
         }, 201
 
+    except PasswordHasherBusy:
+        # Answered with 503 by the app error handler
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         return {'error': 'Failed to create user', 'details': str(e)}, 500
@@ -176,9 +180,10 @@ def update_user(user_id):
         if 'is_active' in data:
             user.is_active = data['is_active']
         if 'password' in data and data['password']:
-            user.password_hash = generate_password_hash(data['password'])
+            user.set_password(data['password'])
 
         db.session.commit()
+        user_status.invalidate(user.id)
 
         user_data = {
             'id': str(user.id),
@@ -200,6 +205,10 @@ def update_user(user_id):
             'user': user_data
         }, 200
 
+    except PasswordHasherBusy:
+        # Answered with 503 by the app error handler
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         return {'error': 'Failed to update user', 'details': str(e)}, 500
@@ -218,6 +227,7 @@ def delete_user(user_id):
         # Soft delete
         user.is_active = False
         db.session.commit()
+        user_status.invalidate(user.id)
 
         return {'message': 'User deactivated successfully'}, 200
 
@@ -238,7 +248,7 @@ def reset_user_password(user_id):
 
         # Generate random password
         new_password = secrets.token_urlsafe(12)
-        user.password_hash = generate_password_hash(new_password)
+        user.set_password(new_password)
 
         db.session.commit()
 
@@ -247,6 +257,10 @@ def reset_user_password(user_id):
             'new_password': new_password  # In production, this should be sent via email
         }, 200
 
+    except PasswordHasherBusy:
+        # Answered with 503 by the app error handler
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         return {'error': 'Failed to reset password', 'details': str(e)}, 500
\ No newline at end of file
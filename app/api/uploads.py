@@ -1,14 +1,18 @@
-from flask import request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
-from models.exam import ExamResult, Consultation
+from models.exam import ExamResult, ExamImage, Consultation
 from models.patient import Animal
 from models.appointment import Appointment
 from extensions import db
+from utils.images import describe_image
 import os
 import uuid
 import secrets
 from datetime import datetime
-from . import admin_bp, admin_required
+from services.authorization import admin_required
+
+# Same /api/admin/uploads URLs, served by the 'uploads' process role
+uploads_bp = Blueprint('admin_uploads', __name__, url_prefix='/api/admin')
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {
@@ -30,7 +34,7 @@ def generate_access_code():
         if not ExamResult.query.filter_by(access_code=code).first():
             return code
 
-@admin_bp.route('/uploads/exam-note', methods=['POST'])
+@uploads_bp.route('/uploads/exam-note', methods=['POST'])
 @admin_required
 def upload_exam_note():
     """Upload exam note PDF and link to an animal/consultation"""
@@ -116,7 +120,7 @@ def upload_exam_note():
             os.remove(file_path)
         return {'error': 'Failed to upload exam note', 'details': str(e)}, 500
 
-@admin_bp.route('/uploads/radiography', methods=['POST'])
+@uploads_bp.route('/uploads/radiography', methods=['POST'])
 @admin_required
 def upload_radiography():
     """Upload radiography images and link to an animal/consultation"""
@@ -158,6 +162,7 @@ def upload_radiography():
 
         # Validate and save each file
         uploaded_files = []
+        images = []
         upload_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'radiographies')
         os.makedirs(upload_dir, exist_ok=True)
 
@@ -172,6 +177,12 @@ def upload_radiography():
             file_path = os.path.join(upload_dir, unique_filename)
             file.save(file_path)
             uploaded_files.append(f"/uploads/radiographies/{unique_filename}")
+            images.append(ExamImage(
+                position=len(images),
+                url=uploaded_files[-1],
+                content_type=file.mimetype,
+                **describe_image(file_path)
+            ))
 
         # Create exam result record
         exam_result = ExamResult(
@@ -181,7 +192,7 @@ def upload_radiography():
             access_code=generate_access_code(),
             findings=findings,
             impression=impression,
-            images_url=uploaded_files,
+            images=images,
             exam_date=datetime.utcnow().date()
         )
 
@@ -211,7 +222,7 @@ def upload_radiography():
                     os.remove(file_path)
         return {'error': 'Failed to upload radiography', 'details': str(e)}, 500
 
-@admin_bp.route('/uploads/bulk', methods=['POST'])
+@uploads_bp.route('/uploads/bulk', methods=['POST'])
 @admin_required
 def bulk_upload_records():
     """Bulk upload multiple exam notes and radiographies"""
@@ -237,6 +248,12 @@ def bulk_upload_records():
                     errors.append(f"Record {i+1}: animal_id is required")
                     continue
 
+                try:
+                    images = ExamImage.from_urls(record.get('images_urls'))
+                except ValueError:
+                    errors.append(f"Record {i+1}: images_urls must be a list of URLs")
+                    continue
+
                 animal = Animal.query.get(record['animal_id'])
                 if not animal:
                     errors.append(f"Record {i+1}: Animal not found")
@@ -251,7 +268,7 @@ def bulk_upload_records():
                     findings=record.get('findings', ''),
                     impression=record.get('impression', ''),
                     pdf_url=record.get('pdf_url', ''),
-                    images_url=record.get('images_urls', []),
+                    images=images,
                     exam_date=datetime.strptime(record['exam_date'], '%Y-%m-%d').date() if record.get('exam_date') else datetime.utcnow().date()
                 )
 
@@ -279,7 +296,7 @@ def bulk_upload_records():
         db.session.rollback()
         return {'error': 'Failed to process bulk upload', 'details': str(e)}, 500
 
-@admin_bp.route('/uploads/record/<record_id>', methods=['GET'])
+@uploads_bp.route('/uploads/record/<record_id>', methods=['GET'])
 @admin_required
 def get_upload_record(record_id):
     """Get details of an uploaded exam record"""
@@ -307,7 +324,7 @@ def get_upload_record(record_id):
             'findings': exam_result.findings,
             'impression': exam_result.impression,
             'pdf_url': exam_result.pdf_url,
-            'images_urls': exam_result.images_url or [],
+            'images_urls': exam_result.images_url,
             'animal': {
                 'id': str(animal.id),
                 'name': animal.name,
@@ -316,6 +333,7 @@ def get_upload_record(record_id):
             } if animal else None,
             'consultation': consultation,
             'last_accessed': exam_result.last_accessed.isoformat() if exam_result.last_accessed else None,
+            'view_count': exam_result.view_count or 0,
             'created_at': exam_result.created_at.isoformat() if exam_result.created_at else None
         }), 200
 
@@ -3,6 +3,7 @@ import sys
 import os
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from datetime import timedelta, datetime
 import logging
 from sqlalchemy import text
@@ -13,14 +14,22 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Import extensions
 from extensions import db, jwt, migrate
 from utils.environment import get_environment_config, validate_environment_config
-from models.user import Clinic, User
-from models.patient import Tutor, Animal
-from models.appointment import Appointment
-from models.exam import Consultation, ExamResult
 
-def create_app():
-    """Create and configure Flask application"""
+# Process roles: each imports and registers only its own blueprints and per-process services
+#   staff   - clinic staff API (auth, appointments, patients, consultations, admin)
+#   portal  - public results portal (WSGI fallback for portal.asgi)
+#   uploads - exam note and radiography uploads
+#   all     - everything in one process
+ROLES = ('all', 'staff', 'portal', 'uploads')
+
+def create_app(role=None):
+    """Create and configure Flask application for a process role (default: APP_ROLE or 'all')"""
+    role = role or os.getenv('APP_ROLE', 'all')
+    if role not in ROLES:
+        raise ValueError(f"Unknown app role '{role}', expected one of {', '.join(ROLES)}")
+
     app = Flask(__name__)
+    app.config['APP_ROLE'] = role
 
     # Configure logging
     if os.getenv('FLASK_ENV') == 'production':
@@ -41,6 +50,12 @@ def create_app():
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET')
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
+    app.config['RATE_LIMIT_STORAGE_URL'] = os.getenv('RATE_LIMIT_STORAGE_URL')
+    app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+
+    # Behind Railway's proxy: take the client address from X-Forwarded-For for rate limiting
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=int(os.getenv('TRUSTED_PROXY_COUNT', '1')), x_proto=1)
 
     # Get environment configuration for CORS
     env_config = get_environment_config()
@@ -58,8 +73,8 @@ def create_app():
          resources={r"/api/*": {
              "origins": env_config['allowed_origins'],
              "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-             "allow_headers": ["Content-Type", "Authorization", "X-Environment"],
-             "expose_headers": ["Content-Type", "Authorization", "X-Environment"],
+             "allow_headers": ["Content-Type", "Authorization", "X-Environment", "If-None-Match"],
+             "expose_headers": ["Content-Type", "Authorization", "X-Environment", "ETag", "Retry-After"],
              "supports_credentials": True,
              "max_age": 3600
          }})
@@ -72,7 +87,7 @@ def create_app():
         # Check if origin is in allowed origins
         if origin in env_config['allowed_origins']:
             response.headers.add('Access-Control-Allow-Origin', origin)
-            response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-Environment')
+            response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-Environment,If-None-Match')
             response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS')
             response.headers.add('Access-Control-Allow-Credentials', 'true')
 
@@ -82,28 +97,62 @@ def create_app():
 
         return response
 
+    # Models related through exams, consultations and appointments are mapped in every role
+    from models.user import Clinic, User
+    from models.patient import Tutor, Animal
+    from models.appointment import Appointment
+    from models.exam import Consultation, ExamResult
+
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
 
-    # Import blueprints
-    from api.auth import auth_bp
-    from api.appointments import appointments_bp
-    from api.patients import patients_bp
-    from api.consultations import consultations_bp
-    from api.public import public_bp
-    from api.clients import clients_bp
-    from app.api.admin import admin_bp
-
-    # Register blueprints
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(appointments_bp)
-    app.register_blueprint(patients_bp)
-    app.register_blueprint(consultations_bp)
-    app.register_blueprint(public_bp)
-    app.register_blueprint(clients_bp)
-    app.register_blueprint(admin_bp)
+    if role in ('all', 'staff', 'portal'):
+        from extensions import rate_limiter
+        rate_limiter.init_app(app)
+
+    if role in ('all', 'portal'):
+        from extensions import access_events, access_codes, result_cache
+        access_events.init_app(app)
+        access_codes.init_app(app)
+        result_cache.init_app(app)
+
+    if role in ('all', 'staff', 'uploads'):
+        from extensions import password_hasher, user_status
+        from services.search_index import register_search_index_listeners
+        from services.weight_history import register_weight_history_listeners
+        password_hasher.init_app(app)
+        user_status.init_app(app)
+        register_search_index_listeners()
+        register_weight_history_listeners()
+
+    if role in ('all', 'staff'):
+        from models.search import SearchEntry
+
+    # Import and register only the blueprints this role serves
+    if role in ('all', 'staff'):
+        from api.auth import auth_bp
+        from api.appointments import appointments_bp
+        from api.patients import patients_bp
+        from api.consultations import consultations_bp
+        from app.api.admin import admin_bp
+
+        app.register_blueprint(auth_bp)
+        app.register_blueprint(appointments_bp)
+        app.register_blueprint(patients_bp)
+        app.register_blueprint(consultations_bp)
+        app.register_blueprint(admin_bp)
+
+    if role in ('all', 'portal'):
+        from api.public import public_bp
+
+        app.register_blueprint(public_bp)
+
+    if role in ('all', 'uploads'):
+        from app.api.uploads import uploads_bp
+
+        app.register_blueprint(uploads_bp)
 
     # Add health check endpoint
     @app.route('/api/health')
@@ -111,7 +160,10 @@ def create_app():
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.utcnow().isoformat(),
-            'version': '1.0.0'
+            'version': '1.0.0',
+            'role': role,
+            'password_hash_queue': app.extensions['password_hasher'].queue_depth
+            if 'password_hasher' in app.extensions else None
         })
 
     return app
@@ -1,3 +1,5 @@
+import importlib
+import threading
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
@@ -5,3 +7,25 @@ from flask_migrate import Migrate
 db = SQLAlchemy()
 jwt = JWTManager()
 migrate = Migrate()
+
+# Per-process services, imported and created on first use so each process
+# role (see app_final.create_app) only loads the ones it needs
+SERVICES = {
+    'access_events': ('services.access_events', 'AccessEventBuffer'),
+    'access_codes': ('services.access_codes', 'AccessCodeFilter'),
+    'result_cache': ('services.result_cache', 'PublicResultCache'),
+    'rate_limiter': ('services.rate_limiter', 'RateLimiter'),
+    'password_hasher': ('services.password_hasher', 'PasswordHasher'),
+    'user_status': ('services.authorization', 'UserStatusCache'),
+}
+
+_services_lock = threading.Lock()
+
+def __getattr__(name):
+    if name not in SERVICES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _services_lock:
+        if name not in globals():
+            module_name, class_name = SERVICES[name]
+            globals()[name] = getattr(importlib.import_module(module_name), class_name)()
+        return globals()[name]
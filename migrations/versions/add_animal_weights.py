@@ -0,0 +1,45 @@
+"""Add append-only animal weight history
+
+Revision ID: b2c7e5a8f396
+Revises: a1b6d4f7e285
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'b2c7e5a8f396'
+down_revision = 'a1b6d4f7e285'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('animal_weights',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('animal_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('weight', sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column('measured_at', sa.DateTime(), nullable=False),
+        sa.Column('consultation_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['animal_id'], ['animals.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['consultation_id'], ['consultations.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_animal_weights_animal_measured_at', 'animal_weights', ['animal_id', 'measured_at'], unique=False)
+
+    # The current weight becomes the first measurement
+    op.execute("""
+        INSERT INTO animal_weights (id, animal_id, weight, measured_at, created_at, updated_at)
+        SELECT gen_random_uuid(), id, weight, COALESCE(updated_at, created_at, now()), now(), now()
+        FROM animals
+        WHERE weight IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_animal_weights_animal_measured_at', table_name='animal_weights')
+    op.drop_table('animal_weights')
@@ -0,0 +1,23 @@
+"""Index animals by tutor for the portal results inbox
+
+Revision ID: 1c8e3b5a9f2c
+Revises: 0b7d2a4f8e1b
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1c8e3b5a9f2c'
+down_revision = '0b7d2a4f8e1b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_animals_tutor_id', 'animals', ['tutor_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_animals_tutor_id', table_name='animals')
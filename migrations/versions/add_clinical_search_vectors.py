@@ -0,0 +1,68 @@
+"""Add Portuguese full-text search vectors to consultations and exam_results
+
+Revision ID: 5c1e9a2f7d30
+Revises: 4b3d4e674b26
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5c1e9a2f7d30'
+down_revision = '4b3d4e674b26'
+branch_labels = None
+depends_on = None
+
+CONSULTATION_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(diagnosis, '')), 'A') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(chief_complaint, '')), 'B') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(physical_exam, '') || ' ' || coalesce(treatment_plan, '')), 'C') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(notes, '')), 'D')"
+)
+
+EXAM_RESULT_SEARCH_EXPRESSION = (
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(impression, '')), 'A') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(findings, '')), 'B') || "
+    "setweight(to_tsvector('pt_unaccent'::regconfig, coalesce(exam_type, '')), 'C')"
+)
+
+
+def upgrade():
+    # Portuguese stemming with accents stripped, so "cardíaco" matches "cardiaco"
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'pt_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION pt_unaccent (COPY = pg_catalog.portuguese);
+                ALTER TEXT SEARCH CONFIGURATION pt_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+            END IF;
+        END
+        $$;
+    """)
+
+    # Generated columns are filled for existing rows when added
+    op.add_column('consultations', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(CONSULTATION_SEARCH_EXPRESSION, persisted=True)
+    ))
+    op.create_index('ix_consultations_search_vector', 'consultations', ['search_vector'],
+                    postgresql_using='gin')
+
+    op.add_column('exam_results', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(EXAM_RESULT_SEARCH_EXPRESSION, persisted=True)
+    ))
+    op.create_index('ix_exam_results_search_vector', 'exam_results', ['search_vector'],
+                    postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_exam_results_search_vector', table_name='exam_results')
+    op.drop_column('exam_results', 'search_vector')
+    op.drop_index('ix_consultations_search_vector', table_name='consultations')
+    op.drop_column('consultations', 'search_vector')
+    op.execute('DROP TEXT SEARCH CONFIGURATION IF EXISTS pt_unaccent')
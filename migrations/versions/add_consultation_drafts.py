@@ -0,0 +1,40 @@
+"""Add consultation versioning and delta-based draft revisions
+
+Revision ID: 8f4b2d5c0a63
+Revises: 7e3a1c4b9f52
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '8f4b2d5c0a63'
+down_revision = '7e3a1c4b9f52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('consultations', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+    op.create_table('consultation_revisions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('consultation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('base_version', sa.Integer(), nullable=True),
+        sa.Column('changes', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['consultation_id'], ['consultations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('consultation_id', 'version', name='uq_consultation_revisions_version')
+    )
+
+
+def downgrade():
+    op.drop_table('consultation_revisions')
+    op.drop_column('consultations', 'version')
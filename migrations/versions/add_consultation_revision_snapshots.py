@@ -0,0 +1,24 @@
+"""Add periodic full snapshots to consultation revisions
+
+Revision ID: 9a5c3e6d1b74
+Revises: 8f4b2d5c0a63
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '9a5c3e6d1b74'
+down_revision = '8f4b2d5c0a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('consultation_revisions', sa.Column('snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    op.drop_column('consultation_revisions', 'snapshot')
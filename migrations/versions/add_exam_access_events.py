@@ -0,0 +1,46 @@
+"""Add append-only exam access events, rollup watermarks and view counts
+
+Revision ID: f6a1c9e2d7da
+Revises: e5f0b8d1c6c9
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'f6a1c9e2d7da'
+down_revision = 'e5f0b8d1c6c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('exam_results', sa.Column('view_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table('exam_access_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('exam_result_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('accessed_at', sa.DateTime(), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=255), nullable=True),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['exam_result_id'], ['exam_results.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exam_access_events_exam_result_id', 'exam_access_events', ['exam_result_id', 'id'], unique=False)
+
+    op.create_table('rollup_watermarks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('rollup_watermarks')
+    op.drop_index('ix_exam_access_events_exam_result_id', table_name='exam_access_events')
+    op.drop_table('exam_access_events')
+    op.drop_column('exam_results', 'view_count')
@@ -0,0 +1,64 @@
+"""Move exam result images from the images_url array to an exam_images table
+
+Revision ID: d4e9a7c0b5b8
+Revises: c3d8f6b9a4a7
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'd4e9a7c0b5b8'
+down_revision = 'c3d8f6b9a4a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('exam_images',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('exam_result_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('checksum', sa.String(length=64), nullable=True),
+        sa.Column('variants', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exam_result_id'], ['exam_results.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('exam_result_id', 'position', name='uq_exam_images_position')
+    )
+    op.create_index('ix_exam_images_checksum', 'exam_images', ['checksum'], unique=False)
+
+    # Array order becomes the image position; metadata of existing files stays unknown
+    op.execute("""
+        INSERT INTO exam_images (id, exam_result_id, position, url, created_at, updated_at)
+        SELECT gen_random_uuid(), e.id, (u.ordinality - 1)::int, u.url, e.created_at, now()
+        FROM exam_results e
+        CROSS JOIN LATERAL unnest(e.images_url) WITH ORDINALITY AS u(url, ordinality)
+        WHERE u.url IS NOT NULL AND u.url <> ''
+    """)
+
+    op.drop_column('exam_results', 'images_url')
+
+
+def downgrade():
+    op.add_column('exam_results', sa.Column('images_url', postgresql.ARRAY(sa.Text()), nullable=True))
+    op.execute("""
+        UPDATE exam_results e
+        SET images_url = i.urls
+        FROM (
+            SELECT exam_result_id, array_agg(url ORDER BY position) AS urls
+            FROM exam_images
+            GROUP BY exam_result_id
+        ) i
+        WHERE i.exam_result_id = e.id
+    """)
+    op.drop_index('ix_exam_images_checksum', table_name='exam_images')
+    op.drop_table('exam_images')
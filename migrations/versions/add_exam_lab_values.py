@@ -0,0 +1,40 @@
+"""Add structured lab values for exam results
+
+Revision ID: a1b6d4f7e285
+Revises: 9a5c3e6d1b74
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a1b6d4f7e285'
+down_revision = '9a5c3e6d1b74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('exam_lab_values',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('exam_result_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('analyte', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column('unit', sa.String(length=20), nullable=True),
+        sa.Column('reference_low', sa.Numeric(precision=12, scale=4), nullable=True),
+        sa.Column('reference_high', sa.Numeric(precision=12, scale=4), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exam_result_id'], ['exam_results.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exam_lab_values_analyte_value', 'exam_lab_values', ['analyte', 'value'], unique=False)
+    op.create_index('ix_exam_lab_values_exam_result_id', 'exam_lab_values', ['exam_result_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_exam_lab_values_exam_result_id', table_name='exam_lab_values')
+    op.drop_index('ix_exam_lab_values_analyte_value', table_name='exam_lab_values')
+    op.drop_table('exam_lab_values')
@@ -0,0 +1,23 @@
+"""Index exam results by animal and exam date for paginated listing
+
+Revision ID: c3d8f6b9a4a7
+Revises: b2c7e5a8f396
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3d8f6b9a4a7'
+down_revision = 'b2c7e5a8f396'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_exam_results_animal_exam_date', 'exam_results', ['animal_id', 'exam_date', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_exam_results_animal_exam_date', table_name='exam_results')
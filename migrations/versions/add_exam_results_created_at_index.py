@@ -0,0 +1,23 @@
+"""Index exam results by creation time for incremental access code refreshes
+
+Revision ID: 0b7d2a4f8e1b
+Revises: f6a1c9e2d7da
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0b7d2a4f8e1b'
+down_revision = 'f6a1c9e2d7da'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_exam_results_created_at', 'exam_results', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_exam_results_created_at', table_name='exam_results')
@@ -0,0 +1,43 @@
+"""Add phonetic name keys to tutors and animals
+
+Revision ID: 6d2f0b3a8e41
+Revises: 5c1e9a2f7d30
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from utils.phonetic import phonetic_tokens
+
+# revision identifiers, used by Alembic.
+revision = '6d2f0b3a8e41'
+down_revision = '5c1e9a2f7d30'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(table):
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(f'SELECT id, name FROM {table}')).fetchall()
+    if rows:
+        conn.execute(
+            sa.text(f'UPDATE {table} SET name_phonetic = :codes WHERE id = :id').bindparams(
+                sa.bindparam('codes', type_=postgresql.ARRAY(sa.String(32)))
+            ),
+            [{'id': row.id, 'codes': phonetic_tokens(row.name)} for row in rows]
+        )
+
+
+def upgrade():
+    for table in ('tutors', 'animals'):
+        op.add_column(table, sa.Column('name_phonetic', postgresql.ARRAY(sa.String(length=32)), nullable=True))
+        _backfill(table)
+        op.create_index(f'ix_{table}_name_phonetic', table, ['name_phonetic'], postgresql_using='gin')
+
+
+def downgrade():
+    for table in ('animals', 'tutors'):
+        op.drop_index(f'ix_{table}_name_phonetic', table_name=table)
+        op.drop_column(table, 'name_phonetic')
@@ -0,0 +1,114 @@
+"""Add unified search_index table for the admin global search
+
+Revision ID: 7e3a1c4b9f52
+Revises: 6d2f0b3a8e41
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7e3a1c4b9f52'
+down_revision = '6d2f0b3a8e41'
+branch_labels = None
+depends_on = None
+
+SEARCH_ENTRY_EXPRESSION = (
+    "setweight(to_tsvector('simple_unaccent'::regconfig, coalesce(terms, '')), 'A') || "
+    "setweight(to_tsvector('simple_unaccent'::regconfig, coalesce(extra_terms, '')), 'B')"
+)
+
+# Snapshot of services.search_index.SOURCES at the time of this migration
+BACKFILL = [
+    ('tutor', """
+        SELECT t.id, t.name,
+               concat_ws(' · ', 'CPF ' || t.cpf, t.phone, t.email),
+               concat_ws(' ', t.name, regexp_replace(t.cpf, '\\D', '', 'g'), t.email),
+               concat_ws(' ', regexp_replace(t.phone, '\\D', '', 'g'), t.address)
+        FROM tutors t
+    """),
+    ('animal', """
+        SELECT a.id, a.name,
+               concat_ws(' · ', a.species, a.breed, 'Microchip ' || nullif(a.microchip, ''), 'Tutor: ' || t.name),
+               concat_ws(' ', a.name, a.microchip),
+               concat_ws(' ', a.species, a.breed, t.name)
+        FROM animals a
+        JOIN tutors t ON t.id = a.tutor_id
+    """),
+    ('user', """
+        SELECT u.id, u.name,
+               concat_ws(' · ', u.email, u.role),
+               concat_ws(' ', u.name, u.email),
+               u.role
+        FROM users u
+    """),
+    ('clinic', """
+        SELECT c.id, c.name,
+               concat_ws(' · ', c.email, c.phone),
+               concat_ws(' ', c.name, c.email),
+               concat_ws(' ', regexp_replace(c.phone, '\\D', '', 'g'), c.address)
+        FROM clinics c
+    """),
+    ('consultation', """
+        SELECT c.id, coalesce(c.diagnosis, c.chief_complaint, 'Consulta'),
+               concat_ws(' · ', a.name, to_char(ap.datetime, 'DD/MM/YYYY HH24:MI')),
+               concat_ws(' ', left(c.diagnosis, 500), left(c.chief_complaint, 500)),
+               a.name
+        FROM consultations c
+        JOIN appointments ap ON ap.id = c.appointment_id
+        JOIN animals a ON a.id = ap.animal_id
+    """),
+    ('exam_result', """
+        SELECT e.id, concat_ws(' · ', e.exam_type, e.access_code),
+               concat_ws(' · ', a.name, to_char(e.exam_date, 'DD/MM/YYYY')),
+               concat_ws(' ', e.access_code, e.exam_type),
+               a.name
+        FROM exam_results e
+        JOIN animals a ON a.id = e.animal_id
+    """),
+]
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'simple_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION simple_unaccent (COPY = pg_catalog.simple);
+                ALTER TEXT SEARCH CONFIGURATION simple_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+            END IF;
+        END
+        $$;
+    """)
+
+    op.create_table('search_index',
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('subtitle', sa.Text(), nullable=True),
+    sa.Column('terms', sa.Text(), nullable=True),
+    sa.Column('extra_terms', sa.Text(), nullable=True),
+    sa.Column('search_vector', postgresql.TSVECTOR(),
+              sa.Computed(SEARCH_ENTRY_EXPRESSION, persisted=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('entity_type', 'entity_id')
+    )
+
+    for entity_type, source in BACKFILL:
+        op.execute(sa.text(f"""
+            INSERT INTO search_index (entity_type, entity_id, title, subtitle, terms, extra_terms, updated_at)
+            SELECT '{entity_type}', src.*, now() FROM ({source}) AS src
+        """))
+
+    op.create_index('ix_search_index_search_vector', 'search_index', ['search_vector'],
+                    postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_search_index_search_vector', table_name='search_index')
+    op.drop_table('search_index')
+    op.execute('DROP TEXT SEARCH CONFIGURATION IF EXISTS simple_unaccent')
@@ -0,0 +1,30 @@
+"""Add normalized, indexed cpf_digits column to tutors
+
+Revision ID: e5f0b8d1c6c9
+Revises: d4e9a7c0b5b8
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5f0b8d1c6c9'
+down_revision = 'd4e9a7c0b5b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated column, Postgres fills existing rows
+    op.add_column('tutors', sa.Column(
+        'cpf_digits', sa.String(length=14),
+        sa.Computed("regexp_replace(cpf, '\\D', '', 'g')", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_tutors_cpf_digits', 'tutors', ['cpf_digits'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tutors_cpf_digits', table_name='tutors')
+    op.drop_column('tutors', 'cpf_digits')
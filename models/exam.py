@@ -1,12 +1,58 @@
 from extensions import db
 from models.base import BaseModel
-from sqlalchemy import Column, String, ForeignKey, Text, Date, DateTime, ARRAY
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, BigInteger, Numeric, ForeignKey, Text, Date, DateTime, Computed, Index, UniqueConstraint, DDL, event, func, literal_column
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR, JSONB
 import secrets
 
+# Portuguese text search configuration with unaccent (see SEARCH_CONFIG_DDL)
+SEARCH_CONFIG = 'pt_unaccent'
+SEARCH_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+CONSULTATION_SEARCH_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(diagnosis, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(chief_complaint, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(physical_exam, '') || ' ' || coalesce(treatment_plan, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(notes, '')), 'D')"
+)
+
+EXAM_RESULT_SEARCH_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(impression, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(findings, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(exam_type, '')), 'C')"
+)
+
+SEARCH_CONFIG_DDL = f"""
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = pg_catalog.portuguese);
+        ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$;
+"""
+
+def clinical_tsquery(term):
+    """Build a tsquery from user input (supports quotes, OR and -exclusions)"""
+    return func.websearch_to_tsquery(SEARCH_REGCONFIG, term)
+
+def clinical_headline(document, tsquery):
+    """Highlighted snippet of the best matching fragments of a document"""
+    return func.ts_headline(
+        SEARCH_REGCONFIG,
+        document,
+        tsquery,
+        'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8'
+    )
+
 class Consultation(db.Model, BaseModel):
     __tablename__ = 'consultations'
+    __table_args__ = (
+        Index('ix_consultations_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     appointment_id = Column(UUID(as_uuid=True), ForeignKey('appointments.id'), nullable=False, unique=True)
     chief_complaint = Column(Text)
@@ -15,10 +61,20 @@ class Consultation(db.Model, BaseModel):
     prognosis = Column(String(50))
     treatment_plan = Column(Text)
     notes = Column(Text)
+    version = Column(Integer, nullable=False, default=1)
+    search_vector = deferred(Column(TSVECTOR, Computed(CONSULTATION_SEARCH_EXPRESSION, persisted=True)))
+
+    # Every UPDATE checks and bumps the version (optimistic concurrency)
+    __mapper_args__ = {'version_id_col': version}
+
+    # Text fields editable through drafts and tracked in revisions
+    EDITABLE_FIELDS = ('chief_complaint', 'physical_exam', 'diagnosis', 'prognosis', 'treatment_plan', 'notes')
 
     # Relationships
     appointment = relationship('Appointment', backref='consultation')
     exam_results = relationship('ExamResult', back_populates='consultation')
+    revisions = relationship('ConsultationRevision', back_populates='consultation',
+                             order_by='ConsultationRevision.version', lazy='dynamic')
 
     def to_dict(self):
         return {
@@ -29,11 +85,83 @@ class Consultation(db.Model, BaseModel):
             'diagnosis': self.diagnosis,
             'prognosis': self.prognosis,
             'treatment_plan': self.treatment_plan,
-            'notes': self.notes
+            'notes': self.notes,
+            'version': self.version
+        }
+
+    def editable_values(self):
+        return {field: getattr(self, field) for field in self.EDITABLE_FIELDS}
+
+    @classmethod
+    def load_detail(cls, consultation_id):
+        """Load a consultation with its appointment, animal and tutor in one statement"""
+        from models.appointment import Appointment
+        from models.patient import Animal
+        from sqlalchemy.orm import joinedload
+
+        return cls.query.options(
+            joinedload(cls.appointment, innerjoin=True)
+            .joinedload(Appointment.animal, innerjoin=True)
+            .joinedload(Animal.tutor, innerjoin=True)
+        ).filter(cls.id == consultation_id).first()
+
+    def to_detail_dict(self):
+        """Detail payload; expects the graph loaded by load_detail"""
+        appointment = self.appointment
+        animal = appointment.animal
+
+        result = self.to_dict()
+        result['created_at'] = self.created_at.isoformat()
+        result['appointment'] = {
+            'datetime': appointment.datetime.isoformat(),
+            'service_type': appointment.service_type,
+            'status': appointment.status,
+            'animal': {**animal.to_summary_dict(), 'tutor': animal.tutor.to_contact_dict()}
+        }
+        return result
+
+class ConsultationRevision(db.Model, BaseModel):
+    """
+    One saved state of a consultation's text fields
+    `changes` is the reverse patch that turns this version back into `base_version`;
+    every few revisions `snapshot` also holds the full values, bounding reconstruction
+    """
+    __tablename__ = 'consultation_revisions'
+    __table_args__ = (
+        UniqueConstraint('consultation_id', 'version', name='uq_consultation_revisions_version'),
+    )
+
+    consultation_id = Column(UUID(as_uuid=True), ForeignKey('consultations.id', ondelete='CASCADE'), nullable=False)
+    version = Column(Integer, nullable=False)
+    base_version = Column(Integer)
+    changes = Column(JSONB, nullable=False, default=list)
+    snapshot = deferred(Column(JSONB))
+    created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'))
+
+    # Relationships
+    consultation = relationship('Consultation', back_populates='revisions')
+    author = relationship('User')
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'base_version': self.base_version,
+            'changed_fields': sorted({op['path'].lstrip('/') for op in self.changes or []}),
+            'created_by': str(self.created_by) if self.created_by else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class ExamResult(db.Model, BaseModel):
     __tablename__ = 'exam_results'
+    __table_args__ = (
+        Index('ix_exam_results_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_exam_results_animal_exam_date', 'animal_id', 'exam_date', 'id'),
+        Index('ix_exam_results_created_at', 'created_at'),
+    )
+
+    # Columns needed by list views; the long text fields are left unloaded
+    SUMMARY_COLUMNS = ('id', 'consultation_id', 'animal_id', 'exam_type', 'exam_date', 'pdf_url')
 
     consultation_id = Column(UUID(as_uuid=True), ForeignKey('consultations.id'), nullable=False)
     animal_id = Column(UUID(as_uuid=True), ForeignKey('animals.id'), nullable=False)
@@ -42,19 +170,43 @@ class ExamResult(db.Model, BaseModel):
     findings = Column(Text, nullable=False)
     impression = Column(Text, nullable=False)
     pdf_url = Column(Text)
-    images_url = Column(ARRAY(Text))
     exam_date = Column(Date, nullable=False)
+    # Maintained by the access event rollup (services.access_events)
     last_accessed = Column(DateTime)
+    view_count = Column(Integer, nullable=False, default=0, server_default='0')
+    search_vector = deferred(Column(TSVECTOR, Computed(EXAM_RESULT_SEARCH_EXPRESSION, persisted=True)))
 
     # Relationships
     consultation = relationship('Consultation', back_populates='exam_results')
     animal = relationship('Animal')
+    lab_values = relationship('ExamLabValue', back_populates='exam_result',
+                              cascade='all, delete-orphan', order_by='ExamLabValue.analyte')
+    images = relationship('ExamImage', back_populates='exam_result',
+                          cascade='all, delete-orphan', order_by='ExamImage.position')
+
+    @property
+    def images_url(self):
+        """Image URLs in display order (loads the images relationship)"""
+        return [image.url for image in self.images]
 
     @staticmethod
     def generate_access_code():
         """Generate a random 8-character access code"""
         return secrets.token_urlsafe(6).upper()[:8]
 
+    @classmethod
+    def generate_access_codes(cls, count):
+        """Generate `count` unused access codes, checking collisions in one query per round"""
+        codes = set()
+        while len(codes) < count:
+            candidates = {cls.generate_access_code() for _ in range(count - len(codes))} - codes
+            taken = {
+                row.access_code for row in
+                db.session.query(cls.access_code).filter(cls.access_code.in_(candidates))
+            }
+            codes |= candidates - taken
+        return list(codes)
+
     def to_dict(self, include_sensitive=False):
         result = {
             'id': str(self.id),
@@ -63,7 +215,7 @@ class ExamResult(db.Model, BaseModel):
             'findings': self.findings,
             'impression': self.impression,
             'pdf_url': self.pdf_url,
-            'images_url': self.images_url or []
+            'images_url': self.images_url
         }
 
         if include_sensitive:
@@ -71,18 +223,32 @@ class ExamResult(db.Model, BaseModel):
             result['consultation_id'] = str(self.consultation_id)
             result['animal_id'] = str(self.animal_id)
             result['last_accessed'] = self.last_accessed.isoformat() if self.last_accessed else None
+            result['view_count'] = self.view_count or 0
 
         return result
 
-    def to_public_dict(self, include_animal=False):
-        """Public-facing dict for results portal"""
+    def to_summary_dict(self):
+        """List view fragment; only touches SUMMARY_COLUMNS"""
+        return {
+            'id': str(self.id),
+            'consultation_id': str(self.consultation_id),
+            'exam_type': self.exam_type,
+            'exam_date': self.exam_date.isoformat(),
+            'has_pdf': bool(self.pdf_url)
+        }
+
+    def to_public_dict(self, include_animal=False, images_url=None):
+        """
+        Public-facing dict for results portal
+        images_url can be passed in when it was already fetched with the result
+        """
         result = {
             'exam_type': self.exam_type,
             'exam_date': self.exam_date.isoformat(),
             'findings': self.findings,
             'impression': self.impression,
             'pdf_url': self.pdf_url,
-            'images_url': self.images_url or []
+            'images_url': self.images_url if images_url is None else images_url
         }
 
         if include_animal and self.animal:
@@ -93,3 +259,170 @@ class ExamResult(db.Model, BaseModel):
             }
 
         return result
+
+class ExamImage(db.Model, BaseModel):
+    """
+    One image of an exam result with its file metadata
+    `variants` maps derivative names (e.g. 'thumbnail') to their URLs
+    """
+    __tablename__ = 'exam_images'
+    __table_args__ = (
+        UniqueConstraint('exam_result_id', 'position', name='uq_exam_images_position'),
+        Index('ix_exam_images_checksum', 'checksum'),
+    )
+
+    exam_result_id = Column(UUID(as_uuid=True), ForeignKey('exam_results.id', ondelete='CASCADE'), nullable=False)
+    position = Column(Integer, nullable=False)
+    url = Column(Text, nullable=False)
+    content_type = Column(String(100))
+    size_bytes = Column(BigInteger)
+    width = Column(Integer)
+    height = Column(Integer)
+    checksum = Column(String(64))
+    variants = Column(JSONB)
+
+    # Relationships
+    exam_result = relationship('ExamResult', back_populates='images')
+
+    @classmethod
+    def from_urls(cls, urls):
+        """Images for a list of already stored URLs, metadata unknown"""
+        if urls is None:
+            return []
+        if not isinstance(urls, list) or not all(isinstance(url, str) and url for url in urls):
+            raise ValueError('images_url must be a list of URLs')
+        return [cls(position=position, url=url) for position, url in enumerate(urls)]
+
+    def to_dict(self):
+        return {
+            'id': str(self.id),
+            'position': self.position,
+            'url': self.url,
+            'content_type': self.content_type,
+            'size_bytes': self.size_bytes,
+            'width': self.width,
+            'height': self.height,
+            'checksum': self.checksum,
+            'variants': self.variants or {}
+        }
+
+class ExamAccessEvent(db.Model):
+    """
+    Append-only record of one public portal access
+    Written in batches by services.access_events, never through the ORM
+    """
+    __tablename__ = 'exam_access_events'
+    __table_args__ = (
+        Index('ix_exam_access_events_exam_result_id', 'exam_result_id', 'id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    exam_result_id = Column(UUID(as_uuid=True), ForeignKey('exam_results.id', ondelete='CASCADE'), nullable=False)
+    accessed_at = Column(DateTime, nullable=False)
+    ip_address = Column(String(45))
+    user_agent = Column(String(255))
+    # Insert time, used by the rollup watermark
+    recorded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def to_dict(self):
+        return {
+            'accessed_at': self.accessed_at.isoformat(),
+            'ip_address': self.ip_address,
+            'user_agent': self.user_agent
+        }
+
+class RollupWatermark(db.Model):
+    """Last event id folded in by a periodic rollup"""
+    __tablename__ = 'rollup_watermarks'
+
+    name = Column(String(50), primary_key=True)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ExamLabValue(db.Model, BaseModel):
+    """
+    One structured analyte measurement of an exam result
+    Indexed on (analyte, value) so range questions run in the database
+    """
+    __tablename__ = 'exam_lab_values'
+    __table_args__ = (
+        Index('ix_exam_lab_values_analyte_value', 'analyte', 'value'),
+        Index('ix_exam_lab_values_exam_result_id', 'exam_result_id'),
+    )
+
+    exam_result_id = Column(UUID(as_uuid=True), ForeignKey('exam_results.id', ondelete='CASCADE'), nullable=False)
+    analyte = Column(String(100), nullable=False)
+    value = Column(Numeric(12, 4), nullable=False)
+    unit = Column(String(20))
+    reference_low = Column(Numeric(12, 4))
+    reference_high = Column(Numeric(12, 4))
+
+    # Relationships
+    exam_result = relationship('ExamResult', back_populates='lab_values')
+
+    @staticmethod
+    def normalize_analyte(analyte):
+        """Analytes are stored lower-case with single spaces ('Creatinine ' -> 'creatinine')"""
+        return ' '.join(str(analyte or '').lower().split())
+
+    @classmethod
+    def from_payload(cls, data):
+        """
+        Build a lab value from an API payload
+        Raises ValueError with a user-facing message when invalid
+        """
+        from decimal import Decimal, InvalidOperation
+
+        if not isinstance(data, dict):
+            raise ValueError('lab value must be an object')
+
+        analyte = cls.normalize_analyte(data.get('analyte'))
+        if not analyte or len(analyte) > 100:
+            raise ValueError('analyte required (max 100 characters)')
+
+        def number(field, required=False):
+            raw = data.get(field)
+            if raw is None or raw == '':
+                if required:
+                    raise ValueError(f'{field} required for {analyte}')
+                return None
+            try:
+                value = Decimal(str(raw).replace(',', '.'))
+            except InvalidOperation:
+                raise ValueError(f'{field} must be a number for {analyte}')
+            if not value.is_finite() or abs(value) >= 10 ** 8:
+                raise ValueError(f'{field} must be a number for {analyte}')
+            return value
+
+        unit = data.get('unit')
+        if unit is not None and len(str(unit)) > 20:
+            raise ValueError(f'unit too long for {analyte}')
+
+        return cls(
+            analyte=analyte,
+            value=number('value', required=True),
+            unit=str(unit) if unit is not None else None,
+            reference_low=number('reference_low'),
+            reference_high=number('reference_high')
+        )
+
+    @property
+    def flag(self):
+        if self.reference_low is not None and self.value < self.reference_low:
+            return 'low'
+        if self.reference_high is not None and self.value > self.reference_high:
+            return 'high'
+        return None
+
+    def to_dict(self):
+        return {
+            'analyte': self.analyte,
+            'value': float(self.value),
+            'unit': self.unit,
+            'reference_low': float(self.reference_low) if self.reference_low is not None else None,
+            'reference_high': float(self.reference_high) if self.reference_high is not None else None,
+            'flag': self.flag
+        }
+
+# Make sure db.create_all() can build the generated search columns
+event.listen(Consultation.__table__, 'before_create', DDL(SEARCH_CONFIG_DDL))
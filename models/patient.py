@@ -1,21 +1,48 @@
 from extensions import db
 from models.base import BaseModel
-from sqlalchemy import Column, String, Boolean, ForeignKey, Text, Date, Numeric
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, ForeignKey, Text, Date, DateTime, Numeric, Index, Computed
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from datetime import datetime
+from utils.phonetic import phonetic_tokens
+from utils.normalization import normalize_cpf
 
 class Tutor(db.Model, BaseModel):
     __tablename__ = 'tutors'
+    __table_args__ = (
+        Index('ix_tutors_name_phonetic', 'name_phonetic', postgresql_using='gin'),
+        Index('ix_tutors_cpf_digits', 'cpf_digits'),
+    )
 
     name = Column(String(255), nullable=False)
     cpf = Column(String(14), unique=True, nullable=False)
+    # Digits-only CPF maintained by Postgres, for format-independent lookups
+    cpf_digits = Column(String(14), Computed(r"regexp_replace(cpf, '\D', '', 'g')", persisted=True))
     phone = Column(String(20))
     email = Column(String(255))
     address = Column(Text)
+    name_phonetic = Column(ARRAY(String(32)))
 
     # Relationships
     animals = relationship('Animal', back_populates='tutor')
 
+    @validates('name')
+    def _update_name_phonetic(self, key, name):
+        self.name_phonetic = phonetic_tokens(name)
+        return name
+
+    @classmethod
+    def find_by_cpf(cls, cpf, exclude_id=None):
+        """Find a tutor by CPF regardless of formatting (123.456.789-00 == 12345678900)"""
+        digits = normalize_cpf(cpf)
+        if not digits:
+            return None
+
+        query = cls.query.filter(cls.cpf_digits == digits)
+        if exclude_id:
+            query = query.filter(cls.id != exclude_id)
+        return query.first()
+
     def to_dict(self):
         return {
             'id': str(self.id),
@@ -26,8 +53,19 @@ class Tutor(db.Model, BaseModel):
             'address': self.address
         }
 
+    def to_contact_dict(self):
+        return {
+            'name': self.name,
+            'phone': self.phone,
+            'email': self.email
+        }
+
 class Animal(db.Model, BaseModel):
     __tablename__ = 'animals'
+    __table_args__ = (
+        Index('ix_animals_name_phonetic', 'name_phonetic', postgresql_using='gin'),
+        Index('ix_animals_tutor_id', 'tutor_id'),
+    )
 
     tutor_id = Column(UUID(as_uuid=True), ForeignKey('tutors.id', ondelete='CASCADE'), nullable=False)
     name = Column(String(255), nullable=False)
@@ -39,27 +77,48 @@ class Animal(db.Model, BaseModel):
     is_neutered = Column(Boolean, default=False)
     microchip = Column(String(50))
     notes = Column(Text)
+    name_phonetic = Column(ARRAY(String(32)))
 
     # Relationships
     tutor = relationship('Tutor', back_populates='animals')
     appointments = relationship('Appointment', back_populates='animal')
+    weight_history = relationship('AnimalWeight', back_populates='animal', lazy='dynamic',
+                                  order_by='AnimalWeight.measured_at', passive_deletes=True)
 
-    def to_dict(self):
+    @validates('name')
+    def _update_name_phonetic(self, key, name):
+        self.name_phonetic = phonetic_tokens(name)
+        return name
+
+    @property
+    def age_years(self):
         from datetime import date
 
-        # Calculate age if birth_date exists
-        age_years = None
-        if self.birth_date:
-            today = date.today()
-            age_years = today.year - self.birth_date.year - ((today.month, today.day) < (self.birth_date.month, self.birth_date.day))
+        if not self.birth_date:
+            return None
+        today = date.today()
+        return today.year - self.birth_date.year - ((today.month, today.day) < (self.birth_date.month, self.birth_date.day))
 
+    def to_summary_dict(self):
+        """Clinical summary without the tutor (no extra lazy loads)"""
+        return {
+            'id': str(self.id),
+            'name': self.name,
+            'species': self.species,
+            'breed': self.breed,
+            'age_years': self.age_years,
+            'sex': self.sex,
+            'weight': float(self.weight) if self.weight else None
+        }
+
+    def to_dict(self):
         return {
             'id': str(self.id),
             'name': self.name,
             'species': self.species,
             'breed': self.breed,
             'birth_date': self.birth_date.isoformat() if self.birth_date else None,
-            'age_years': age_years,
+            'age_years': self.age_years,
             'sex': self.sex,
             'weight': float(self.weight) if self.weight else None,
             'is_neutered': self.is_neutered,
@@ -70,3 +129,28 @@ class Animal(db.Model, BaseModel):
 
     def to_dict_with_tutor(self):
         return self.to_dict()
+
+class AnimalWeight(db.Model, BaseModel):
+    """
+    Append-only weight measurement
+    Animal.weight keeps the latest value; every change is also recorded here
+    """
+    __tablename__ = 'animal_weights'
+    __table_args__ = (
+        Index('ix_animal_weights_animal_measured_at', 'animal_id', 'measured_at'),
+    )
+
+    animal_id = Column(UUID(as_uuid=True), ForeignKey('animals.id', ondelete='CASCADE'), nullable=False)
+    weight = Column(Numeric(5, 2), nullable=False)
+    measured_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    consultation_id = Column(UUID(as_uuid=True), ForeignKey('consultations.id', ondelete='SET NULL'))
+
+    # Relationships
+    animal = relationship('Animal', back_populates='weight_history')
+
+    def to_dict(self):
+        return {
+            'weight': float(self.weight),
+            'measured_at': self.measured_at.isoformat(),
+            'consultation_id': str(self.consultation_id) if self.consultation_id else None
+        }
@@ -0,0 +1,48 @@
+from datetime import datetime
+from extensions import db
+from sqlalchemy import Column, String, Text, DateTime, Computed, Index, DDL, event, literal_column
+from sqlalchemy.orm import deferred
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+
+# Names and identifiers are not stemmed, only lower-cased and unaccented
+INDEX_SEARCH_CONFIG = 'simple_unaccent'
+INDEX_SEARCH_REGCONFIG = literal_column(f"'{INDEX_SEARCH_CONFIG}'::regconfig")
+
+SEARCH_ENTRY_EXPRESSION = (
+    f"setweight(to_tsvector('{INDEX_SEARCH_CONFIG}'::regconfig, coalesce(terms, '')), 'A') || "
+    f"setweight(to_tsvector('{INDEX_SEARCH_CONFIG}'::regconfig, coalesce(extra_terms, '')), 'B')"
+)
+
+INDEX_SEARCH_CONFIG_DDL = f"""
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{INDEX_SEARCH_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {INDEX_SEARCH_CONFIG} (COPY = pg_catalog.simple);
+        ALTER TEXT SEARCH CONFIGURATION {INDEX_SEARCH_CONFIG}
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+    END IF;
+END
+$$;
+"""
+
+class SearchEntry(db.Model):
+    """
+    One row per searchable entity (tutor, animal, user, clinic, consultation, exam_result)
+    Maintained by services.search_index, never written by request handlers
+    """
+    __tablename__ = 'search_index'
+    __table_args__ = (
+        Index('ix_search_index_search_vector', 'search_vector', postgresql_using='gin'),
+    )
+
+    entity_type = Column(String(20), primary_key=True)
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
+    title = Column(Text, nullable=False)
+    subtitle = Column(Text)
+    terms = Column(Text)
+    extra_terms = Column(Text)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_ENTRY_EXPRESSION, persisted=True)))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+event.listen(SearchEntry.__table__, 'before_create', DDL(INDEX_SEARCH_CONFIG_DDL))
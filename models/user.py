@@ -1,6 +1,5 @@
 from extensions import db
 from models.base import BaseModel
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import Column, String, Boolean, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -31,10 +30,20 @@ class User(db.Model, BaseModel):
     clinic = relationship('Clinic', back_populates='users')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        from extensions import password_hasher
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        from extensions import password_hasher
+        return password_hasher.verify(password, self.password_hash)
+
+    def rehash_password_if_needed(self, password):
+        """Re-hash with the current algorithm and cost after a successful check"""
+        from extensions import password_hasher
+        if password_hasher.needs_rehash(self.password_hash):
+            self.set_password(password)
+            return True
+        return False
 
     @property
     def is_dr_saulo(self):
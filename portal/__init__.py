@@ -0,0 +1,7 @@
+"""
+Public results portal as a standalone ASGI service.
+Serves the /api/public endpoints with psycopg's async driver and an async
+connection pool, so tutor lookups can run as their own process:
+
+    uvicorn portal.asgi:app --proxy-headers --forwarded-allow-ips='*'
+"""
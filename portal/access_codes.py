@@ -0,0 +1,94 @@
+"""
+Bloom filter of existing access codes for the async portal.
+Same sizing and refresh policy as services.access_codes, with the build
+and incremental refresh queries run on the async pool. New codes are
+picked up by the periodic created_at refresh, or sooner after a miss.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from services.access_codes import (
+    ERROR_RATE, MIN_CAPACITY, REFRESH_INTERVAL, MISS_REFRESH_INTERVAL,
+    REBUILD_INTERVAL, REFRESH_OVERLAP, AccessCodeFilter
+)
+from utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+class AsyncAccessCodeFilter:
+    def __init__(self, pool):
+        self.pool = pool
+        self._filter = None
+        self._lock = asyncio.Lock()
+        self._built_at = 0.0
+        self._refreshed_at = 0.0
+        self._since = None
+
+    normalize = staticmethod(AccessCodeFilter.normalize)
+
+    async def rebuild(self):
+        """Build a new filter from every access code in the database"""
+        started = datetime.utcnow()
+        async with self.pool.connection() as connection:
+            count = (await (await connection.execute("SELECT count(*) FROM exam_results")).fetchone())[0]
+            bloom = BloomFilter(max(int(count * 1.5), MIN_CAPACITY), ERROR_RATE)
+
+            # Server-side cursor, so the codes are streamed rather than loaded at once
+            async with connection.cursor(name='portal_access_codes') as cursor:
+                await cursor.execute("SELECT access_code FROM exam_results")
+                async for (code,) in cursor:
+                    bloom.add(self.normalize(code))
+
+        self._filter = bloom
+        self._since = started - REFRESH_OVERLAP
+        self._built_at = self._refreshed_at = time.monotonic()
+        logger.info('Access code filter built with %d codes', bloom.count)
+
+    async def refresh(self):
+        """Add codes created since the last build or refresh"""
+        started = datetime.utcnow()
+        async with self.pool.connection() as connection:
+            cursor = await connection.execute(
+                "SELECT access_code FROM exam_results WHERE created_at >= %(since)s", {'since': self._since}
+            )
+            for (code,) in await cursor.fetchall():
+                self._filter.add(self.normalize(code))
+
+        self._since = started - REFRESH_OVERLAP
+        self._refreshed_at = time.monotonic()
+
+    async def _maybe_refresh(self, interval):
+        now = time.monotonic()
+        if self._filter is not None and now - self._refreshed_at < interval and now - self._built_at < REBUILD_INTERVAL:
+            return False
+
+        # One task refreshes, the others use the current filter
+        if self._filter is not None and self._lock.locked():
+            return False
+        async with self._lock:
+            now = time.monotonic()
+            if self._filter is None or now - self._built_at >= REBUILD_INTERVAL:
+                await self.rebuild()
+            elif now - self._refreshed_at >= interval:
+                await self.refresh()
+            else:
+                return False
+            return True
+
+    async def might_exist(self, code):
+        """
+        False only when the code certainly does not exist.
+        Falls back to True (let the database decide) if the filter cannot be built.
+        """
+        code = self.normalize(code)
+        try:
+            await self._maybe_refresh(REFRESH_INTERVAL)
+            if code in self._filter:
+                return True
+            # Possibly created by the staff API since the last refresh
+            return await self._maybe_refresh(MISS_REFRESH_INTERVAL) and code in self._filter
+        except Exception:
+            logger.exception('Access code filter unavailable')
+            return True
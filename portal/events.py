@@ -0,0 +1,107 @@
+"""
+Write-behind access recording for the async portal.
+Same table and batching as services.access_events, driven by an asyncio
+task instead of a thread. The rollup reuses the synchronous implementation
+in a worker thread, once a minute.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from services.access_events import (
+    BATCH_SIZE, FLUSH_INTERVAL, ROLLUP_INTERVAL, MAX_BUFFERED, MAX_FLUSH_ATTEMPTS,
+    STAGING_SQL, COPY_SQL, INSERT_SQL, rollup
+)
+
+logger = logging.getLogger(__name__)
+
+class AsyncAccessEventBuffer:
+    def __init__(self, pool, database_url):
+        self.pool = pool
+        self.database_url = database_url
+        self._events = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._engine = None
+        self._failed_attempts = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def record(self, exam_result_id, ip_address=None, user_agent=None):
+        """Queue one access; never awaits the database"""
+        if len(self._events) >= MAX_BUFFERED:
+            logger.warning('Access event buffer full, dropping event')
+            return
+        self._events.append((exam_result_id, datetime.utcnow(), ip_address, (user_agent or '')[:255] or None))
+        if len(self._events) >= BATCH_SIZE:
+            self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        last_rollup = loop.time()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+            if loop.time() - last_rollup >= ROLLUP_INTERVAL:
+                last_rollup = loop.time()
+                await asyncio.to_thread(self._run_rollup)
+
+    async def flush(self):
+        """Copy buffered events into exam_access_events in one batch"""
+        events, self._events = self._events, []
+        if not events:
+            return 0
+
+        try:
+            async with self.pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(STAGING_SQL)
+                    async with cursor.copy(COPY_SQL) as copy:
+                        for event in events:
+                            await copy.write_row(event)
+                    await cursor.execute(INSERT_SQL)
+                    inserted = cursor.rowcount
+        except Exception:
+            logger.exception('Failed to flush %d access events', len(events))
+            self._failed_attempts += 1
+            if self._failed_attempts >= MAX_FLUSH_ATTEMPTS:
+                logger.error('Dropping %d access events after %d failed flushes', len(events), self._failed_attempts)
+                self._failed_attempts = 0
+            else:
+                self._events[:0] = events[:max(MAX_BUFFERED - len(self._events), 0)]
+            return 0
+
+        self._failed_attempts = 0
+        if inserted < len(events):
+            logger.info('Skipped %d access events of deleted exam results', len(events) - inserted)
+        return inserted
+
+    def _run_rollup(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import NullPool
+
+        try:
+            if self._engine is None:
+                self._engine = create_engine(self.database_url, poolclass=NullPool)
+            with self._engine.begin() as connection:
+                return rollup(connection)
+        except Exception:
+            logger.exception('Access event rollup failed')
+            return None
@@ -0,0 +1,95 @@
+"""
+Portal lookups as plain SQL for the async driver.
+Each is a single indexed statement: exam_results.access_code (unique),
+tutors.cpf_digits, animals.tutor_id and exam_results (animal_id, exam_date, id).
+"""
+
+from psycopg.rows import dict_row
+from utils.portal import result_stamp_sql
+
+PORTAL_FROM = """
+    FROM exam_results e
+    JOIN animals a ON a.id = e.animal_id
+    JOIN tutors t ON t.id = a.tutor_id
+"""
+
+DOCUMENT_SQL = """
+    SELECT e.id, e.exam_type, e.exam_date, e.findings, e.impression, e.pdf_url,
+           a.name AS animal_name, a.species AS animal_species, a.breed AS animal_breed,
+           t.name AS tutor_name,
+           (SELECT array_agg(i.url ORDER BY i.position)
+            FROM exam_images i WHERE i.exam_result_id = e.id) AS images_url
+""" + PORTAL_FROM
+
+CREDENTIALS_WHERE = "WHERE e.access_code = %(access_code)s AND t.cpf_digits = %(cpf)s"
+
+STAMP_SQL = result_stamp_sql('%(id)s')
+
+VERIFY_SQL = "SELECT e.exam_type" + PORTAL_FROM + CREDENTIALS_WHERE
+
+INBOX_SQL = """
+    SELECT e.id, e.exam_type, e.exam_date, a.name AS animal_name, a.species AS animal_species
+""" + PORTAL_FROM + """
+    WHERE t.cpf_digits = %(cpf)s
+      AND EXISTS (
+          SELECT 1 FROM exam_results ce
+          JOIN animals ca ON ca.id = ce.animal_id
+          WHERE ce.access_code = %(access_code)s AND ca.tutor_id = t.id
+      )
+      {after}
+    ORDER BY e.exam_date DESC, e.id DESC
+    LIMIT %(limit)s
+"""
+
+INBOX_AFTER = "AND (e.exam_date, e.id) < (%(after_date)s, %(after_id)s)"
+
+async def _fetch(pool, sql, params, many=False):
+    async with pool.connection() as connection:
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(sql, params)
+            return await (cursor.fetchall() if many else cursor.fetchone())
+
+async def load_document_by_credentials(pool, access_code, cpf):
+    return await _fetch(pool, DOCUMENT_SQL + CREDENTIALS_WHERE, {'access_code': access_code, 'cpf': cpf})
+
+async def load_document_by_id(pool, exam_result_id):
+    return await _fetch(pool, DOCUMENT_SQL + "WHERE e.id = %(id)s", {'id': exam_result_id})
+
+async def load_stamp(pool, exam_result_id):
+    return await _fetch(pool, STAMP_SQL, {'id': exam_result_id})
+
+async def verify(pool, access_code, cpf):
+    row = await _fetch(pool, VERIFY_SQL, {'access_code': access_code, 'cpf': cpf})
+    return row['exam_type'] if row else None
+
+async def inbox(pool, access_code, cpf, limit, after=None):
+    """
+    Results of the tutor owning access_code, newest first.
+    after is an optional (exam_date, id) keyset position.
+    """
+    params = {'access_code': access_code, 'cpf': cpf, 'limit': limit}
+    if after:
+        params['after_date'], params['after_id'] = after
+    sql = INBOX_SQL.format(after=INBOX_AFTER if after else '')
+    return await _fetch(pool, sql, params, many=True)
+
+def document(row):
+    """Same shape as the Flask portal's result document"""
+    return {
+        'result': {
+            'exam_type': row['exam_type'],
+            'exam_date': row['exam_date'].isoformat(),
+            'findings': row['findings'],
+            'impression': row['impression'],
+            'pdf_url': row['pdf_url'],
+            'images_url': row['images_url'] or [],
+            'animal': {
+                'name': row['animal_name'],
+                'species': row['animal_species'],
+                'breed': row['animal_breed']
+            }
+        },
+        'tutor': {
+            'name': row['tutor_name']
+        }
+    }
@@ -3,7 +3,7 @@ from extensions import db
 from models.user import Clinic, User
 from models.patient import Tutor, Animal
 from models.appointment import Appointment
-from models.exam import Consultation, ExamResult
+from models.exam import Consultation, ExamResult, ExamImage
 from datetime import datetime, timedelta
 
 app = create_app()
@@ -269,7 +269,7 @@ with app.app_context():
         impression='Stage B1 myxomatous mitral valve disease. Currently asymptomatic.',
         exam_date=datetime.now().date(),
         pdf_url='/results/thor_echo_2024.pdf',
-        images_url=['/results/thor_echo_1.jpg', '/results/thor_echo_2.jpg']
+        images=ExamImage.from_urls(['/results/thor_echo_1.jpg', '/results/thor_echo_2.jpg'])
     )
     db.session.add(result3)
 
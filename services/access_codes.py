@@ -0,0 +1,122 @@
+"""
+Per-process Bloom filter of existing exam access codes.
+Lets the public portal reject codes that definitely do not exist without
+querying Postgres. New codes are added in-process when results are inserted
+and picked up from other workers by small incremental refreshes; the whole
+filter is rebuilt periodically so deleted codes age out.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+ERROR_RATE = 0.001
+MIN_CAPACITY = 10000
+
+# Incremental refresh cadence, and the shorter one used after a miss so a
+# code created on another worker is accepted within a few seconds
+REFRESH_INTERVAL = 30
+MISS_REFRESH_INTERVAL = 5
+REBUILD_INTERVAL = 3600
+
+# Overlap between refresh windows, covering rows committed after their created_at
+REFRESH_OVERLAP = timedelta(minutes=2)
+
+class AccessCodeFilter:
+    def __init__(self, app=None):
+        self._filter = None
+        self._lock = threading.Lock()
+        self._built_at = 0.0
+        self._refreshed_at = 0.0
+        self._since = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from sqlalchemy import event
+        from models.exam import ExamResult
+
+        app.extensions['access_codes'] = self
+        if not event.contains(ExamResult, 'after_insert', self._after_insert):
+            event.listen(ExamResult, 'after_insert', self._after_insert)
+
+    @staticmethod
+    def normalize(code):
+        return (code or '').strip().upper()
+
+    def _after_insert(self, mapper, connection, target):
+        # A rolled back insert only leaves a harmless false positive
+        current = self._filter
+        if current is not None and target.access_code:
+            current.add(self.normalize(target.access_code))
+
+    def rebuild(self):
+        """Build a new filter from every access code in the database"""
+        from extensions import db
+        from models.exam import ExamResult
+
+        started = datetime.utcnow()
+        count = db.session.query(ExamResult.id).count()
+        bloom = BloomFilter(max(int(count * 1.5), MIN_CAPACITY), ERROR_RATE)
+
+        for (code,) in db.session.query(ExamResult.access_code).yield_per(5000):
+            bloom.add(self.normalize(code))
+
+        self._filter = bloom
+        self._since = started - REFRESH_OVERLAP
+        self._built_at = self._refreshed_at = time.monotonic()
+        logger.info('Access code filter built with %d codes', bloom.count)
+
+    def refresh(self):
+        """Add codes created since the last build or refresh"""
+        from extensions import db
+        from models.exam import ExamResult
+
+        started = datetime.utcnow()
+        codes = db.session.query(ExamResult.access_code).filter(ExamResult.created_at >= self._since)
+        bloom = self._filter
+        for (code,) in codes:
+            bloom.add(self.normalize(code))
+
+        self._since = started - REFRESH_OVERLAP
+        self._refreshed_at = time.monotonic()
+
+    def _maybe_refresh(self, interval):
+        now = time.monotonic()
+        if self._filter is not None and now - self._refreshed_at < interval and now - self._built_at < REBUILD_INTERVAL:
+            return False
+
+        # One worker thread refreshes, the others use the current filter
+        if not self._lock.acquire(blocking=self._filter is None):
+            return False
+        try:
+            now = time.monotonic()
+            if self._filter is None or now - self._built_at >= REBUILD_INTERVAL:
+                self.rebuild()
+            elif now - self._refreshed_at >= interval:
+                self.refresh()
+            else:
+                return False
+            return True
+        finally:
+            self._lock.release()
+
+    def might_exist(self, code):
+        """
+        False only when the code certainly does not exist.
+        Falls back to True (let the database decide) if the filter cannot be built.
+        """
+        code = self.normalize(code)
+        try:
+            self._maybe_refresh(REFRESH_INTERVAL)
+            if code in self._filter:
+                return True
+            # Possibly created on another worker since the last refresh
+            return self._maybe_refresh(MISS_REFRESH_INTERVAL) and code in self._filter
+        except Exception:
+            logger.exception('Access code filter unavailable')
+            return True
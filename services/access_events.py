@@ -0,0 +1,209 @@
+"""
+Write-behind recording of public portal accesses.
+Requests only append to an in-process buffer; a background thread copies
+the buffer into exam_access_events in batches and periodically rolls the
+new events up into exam_results.last_accessed / view_count.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Flush when this many events are waiting, or every FLUSH_INTERVAL seconds
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 5
+ROLLUP_INTERVAL = 60
+
+# Events are rolled up only once they are this old, so a batch still being
+# committed by another worker is never skipped by the watermark
+ROLLUP_DELAY_SECONDS = 30
+
+# Drop (and log) events beyond this if the database is unavailable
+MAX_BUFFERED = 50000
+
+# A batch that keeps failing is dropped after this many attempts
+MAX_FLUSH_ATTEMPTS = 5
+
+# Batches are copied into a per-connection staging table and moved over joined
+# to exam_results, so an event for a result deleted meanwhile is skipped
+# instead of failing the whole batch on the foreign key
+STAGING_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS exam_access_events_staging (
+        exam_result_id uuid,
+        accessed_at timestamp,
+        ip_address text,
+        user_agent text
+    ) ON COMMIT DELETE ROWS
+"""
+
+COPY_SQL = "COPY exam_access_events_staging (exam_result_id, accessed_at, ip_address, user_agent) FROM STDIN"
+
+INSERT_SQL = """
+    INSERT INTO exam_access_events (exam_result_id, accessed_at, ip_address, user_agent)
+    SELECT s.exam_result_id, s.accessed_at, left(s.ip_address, 45), left(s.user_agent, 255)
+    FROM exam_access_events_staging s
+    JOIN exam_results e ON e.id = s.exam_result_id
+"""
+
+ROLLUP_WATERMARK = 'exam_access_events'
+
+ROLLUP_SQL = """
+    WITH batch AS (
+        SELECT exam_result_id, max(accessed_at) AS last_accessed, count(*) AS views
+        FROM exam_access_events
+        WHERE id > :after AND id <= :upto
+        GROUP BY exam_result_id
+    )
+    UPDATE exam_results e
+    SET last_accessed = GREATEST(e.last_accessed, batch.last_accessed),
+        view_count = e.view_count + batch.views
+    FROM batch
+    WHERE e.id = batch.exam_result_id
+"""
+
+def rollup(connection):
+    """
+    Fold events newer than the watermark into exam_results.
+    Returns the number of results updated, or None if another worker holds the lock.
+    """
+    from sqlalchemy import text
+
+    watermark = connection.execute(text("""
+        SELECT last_id FROM rollup_watermarks WHERE name = :name FOR UPDATE SKIP LOCKED
+    """), {'name': ROLLUP_WATERMARK}).first()
+
+    if watermark is None:
+        # First run creates the row; a concurrent creator simply wins
+        connection.execute(text("""
+            INSERT INTO rollup_watermarks (name, last_id) VALUES (:name, 0) ON CONFLICT DO NOTHING
+        """), {'name': ROLLUP_WATERMARK})
+        return None
+
+    upto = connection.execute(text("""
+        SELECT max(id) FROM exam_access_events
+        WHERE id > :after AND recorded_at < now() - make_interval(secs => :delay)
+    """), {'after': watermark.last_id, 'delay': ROLLUP_DELAY_SECONDS}).scalar()
+
+    if upto is None:
+        return 0
+
+    updated = connection.execute(text(ROLLUP_SQL), {'after': watermark.last_id, 'upto': upto}).rowcount
+    connection.execute(text("""
+        UPDATE rollup_watermarks SET last_id = :upto, updated_at = now() WHERE name = :name
+    """), {'upto': upto, 'name': ROLLUP_WATERMARK})
+    return updated
+
+class AccessEventBuffer:
+    """Per-process buffer of portal access events"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._events = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._failed_attempts = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['access_events'] = self
+        atexit.register(self.flush)
+
+    def record(self, exam_result_id, ip_address=None, user_agent=None):
+        """Queue one access; never touches the database on the request path"""
+        event = (exam_result_id, datetime.utcnow(), ip_address, (user_agent or '')[:255] or None)
+
+        with self._lock:
+            if len(self._events) >= MAX_BUFFERED:
+                logger.warning('Access event buffer full, dropping event')
+                return
+            self._events.append(event)
+            pending = len(self._events)
+
+        self._ensure_worker()
+        if pending >= BATCH_SIZE:
+            self._wakeup.set()
+
+    def _ensure_worker(self):
+        # Started lazily so each (forked) worker process gets its own thread
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='access-events', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        last_rollup = datetime.utcnow()
+        while True:
+            self._wakeup.wait(FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+
+            if (datetime.utcnow() - last_rollup).total_seconds() >= ROLLUP_INTERVAL:
+                last_rollup = datetime.utcnow()
+                self.run_rollup()
+
+    def flush(self):
+        """Copy buffered events into exam_access_events in one batch"""
+        from extensions import db
+        from sqlalchemy import text
+
+        with self._lock:
+            events, self._events = self._events, []
+
+        if not events or self.app is None:
+            return 0
+
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    connection.execute(text(STAGING_SQL))
+                    raw_connection = connection.connection.driver_connection
+                    with raw_connection.cursor() as cursor:
+                        with cursor.copy(COPY_SQL) as copy:
+                            for event in events:
+                                copy.write_row(event)
+                    inserted = connection.execute(text(INSERT_SQL)).rowcount
+        except Exception:
+            logger.exception('Failed to flush %d access events', len(events))
+            self._requeue(events)
+            return 0
+
+        self._failed_attempts = 0
+        if inserted < len(events):
+            logger.info('Skipped %d access events of deleted exam results', len(events) - inserted)
+        return inserted
+
+    def _requeue(self, events):
+        """Put a failed batch back for the next attempt, or drop it after MAX_FLUSH_ATTEMPTS"""
+        self._failed_attempts += 1
+        if self._failed_attempts >= MAX_FLUSH_ATTEMPTS:
+            logger.error('Dropping %d access events after %d failed flushes', len(events), self._failed_attempts)
+            self._failed_attempts = 0
+            return
+        with self._lock:
+            self._events[:0] = events[:max(MAX_BUFFERED - len(self._events), 0)]
+
+    def run_rollup(self):
+        from extensions import db
+
+        if self.app is None:
+            return None
+
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    return rollup(connection)
+        except Exception:
+            logger.exception('Access event rollup failed')
+            return None
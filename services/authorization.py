@@ -0,0 +1,98 @@
+"""
+Authorization from signed JWT claims.
+Role and clinic come from the token issued at login; the only state read
+per request is whether the account is still active with that role and
+clinic, from a small per-worker cache. Cached entries are dropped when the
+user row changes in this worker; other workers converge within STATUS_TTL.
+"""
+
+from functools import wraps
+from sqlalchemy import event
+from utils.cache import TTLCache
+
+MAX_ENTRIES = 4096
+STATUS_TTL = 60
+
+class UserStatusCache:
+    def __init__(self, app=None):
+        self.cache = TTLCache(MAX_ENTRIES, STATUS_TTL)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from models.user import User
+
+        app.extensions['user_status'] = self
+        for name in ('after_update', 'after_delete'):
+            if not event.contains(User, name, self._evict):
+                event.listen(User, name, self._evict)
+
+    def get(self, user_id):
+        """
+        Current status of a user.
+
+        Returns:
+            Dict with is_active, role and clinic_id, or None when the user does not exist
+        """
+        from extensions import db
+        from models.user import User
+
+        key = str(user_id)
+        hit, status = self.cache.get(key)
+        if hit:
+            return status
+
+        row = db.session.query(User.is_active, User.role, User.clinic_id).filter(User.id == key).first()
+        status = {
+            'is_active': bool(row.is_active),
+            'role': row.role,
+            'clinic_id': str(row.clinic_id) if row.clinic_id else None
+        } if row else None
+
+        self.cache.set(key, status)
+        return status
+
+    def invalidate(self, user_id):
+        self.cache.delete(str(user_id))
+
+    def _evict(self, mapper, connection, target):
+        self.invalidate(target.id)
+
+def current_claims():
+    """
+    Claims of the current JWT, or None when the account has since been
+    disabled, removed, or moved to another role or clinic.
+    """
+    from flask_jwt_extended import get_jwt, get_jwt_identity
+    from extensions import user_status
+
+    claims = get_jwt()
+    status = user_status.get(get_jwt_identity())
+
+    if not status or not status['is_active']:
+        return None
+    if status['role'] != claims.get('role') or status['clinic_id'] != claims.get('clinic_id'):
+        return None
+
+    return claims
+
+def can_access_clinic(claims, clinic_id):
+    return bool(claims.get('is_dr_saulo')) or str(clinic_id) == claims.get('clinic_id')
+
+def admin_required(f):
+    """
+    Decorator to ensure only Dr. Saulo (system owner) can access admin endpoints
+    """
+    from flask_jwt_extended import jwt_required
+
+    @wraps(f)
+    @jwt_required()
+    def decorated_function(*args, **kwargs):
+        claims = current_claims()
+
+        if not claims or not claims.get('is_dr_saulo'):
+            return {'error': 'Access denied. Admin privileges required.'}, 403
+
+        return f(*args, **kwargs)
+
+    return decorated_function
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from utils.deltas import apply_patch, diff_values
+
+# Autosaves by the same author within this window fold into one revision
+AUTOSAVE_WINDOW = timedelta(minutes=2)
+
+# A full snapshot is stored every this many revisions, so rebuilding any
+# version applies at most this many reverse patches
+SNAPSHOT_INTERVAL = 10
+
+class ConsultationRevisionService:
+    def __init__(self, db_session):
+        self.db = db_session
+
+    def latest(self, consultation_id):
+        from models.exam import ConsultationRevision
+
+        return self.db.query(ConsultationRevision).filter_by(
+            consultation_id=consultation_id
+        ).order_by(ConsultationRevision.version.desc()).first()
+
+    def _needs_snapshot(self, consultation_id):
+        """True when SNAPSHOT_INTERVAL - 1 revisions were stored since the last snapshot"""
+        from models.exam import ConsultationRevision
+
+        last_snapshot = self.db.query(func.max(ConsultationRevision.version)).filter(
+            ConsultationRevision.consultation_id == consultation_id,
+            ConsultationRevision.snapshot.isnot(None)
+        ).scalar_subquery()
+
+        since = self.db.query(func.count(ConsultationRevision.id)).filter(
+            ConsultationRevision.consultation_id == consultation_id,
+            ConsultationRevision.version > func.coalesce(last_snapshot, 0)
+        ).scalar()
+
+        return since >= SNAPSHOT_INTERVAL - 1
+
+    def record_initial(self, consultation, user_id):
+        """Record the first version of a new consultation as a snapshot"""
+        from models.exam import ConsultationRevision
+
+        revision = ConsultationRevision(
+            consultation_id=consultation.id,
+            version=consultation.version or 1,
+            base_version=None,
+            changes=[],
+            snapshot=consultation.editable_values(),
+            created_by=user_id
+        )
+        self.db.add(revision)
+        return revision
+
+    def record(self, consultation, before, before_version, user_id, fold=False):
+        """
+        Record the change from `before` to the consultation's current (flushed) values.
+        Only the reverse patch is stored, so a revision costs the size of the edit.
+        With fold=True, rapid autosaves by the same author update the latest
+        revision in place instead of adding one row per keystroke burst.
+        """
+        from models.exam import Consultation, ConsultationRevision
+
+        after = consultation.editable_values()
+        last = self.latest(consultation.id)
+        now = datetime.utcnow()
+
+        if (fold and last and last.version == before_version
+                and last.base_version is not None
+                and str(last.created_by) == str(user_id)
+                and last.updated_at and now - last.updated_at <= AUTOSAVE_WINDOW):
+            # Rebuild the state the revision started from, then diff against it
+            base_values = apply_patch(before, last.changes, Consultation.EDITABLE_FIELDS)
+            last.changes = diff_values(after, base_values)
+            last.version = consultation.version
+            last.updated_at = now
+            if last.snapshot is not None:
+                last.snapshot = after
+            return last
+
+        revision = ConsultationRevision(
+            consultation_id=consultation.id,
+            version=consultation.version,
+            base_version=before_version,
+            changes=diff_values(after, before),
+            snapshot=after if self._needs_snapshot(consultation.id) else None,
+            created_by=user_id
+        )
+        self.db.add(revision)
+        return revision
+
+    def values_at(self, consultation, version):
+        """
+        Rebuild the editable values of a past version.
+        Starts from the nearest snapshot at or above `version` (or the live row)
+        and applies reverse patches downwards, touching at most SNAPSHOT_INTERVAL rows.
+        Versions folded away by autosave resolve to the closest earlier version.
+        Returns (values, resolved_version), or None if the version never existed.
+        """
+        from models.exam import Consultation, ConsultationRevision
+
+        if version < 1 or version > consultation.version:
+            return None
+
+        if version == consultation.version:
+            return consultation.editable_values(), consultation.version
+
+        start = self.db.query(ConsultationRevision.version, ConsultationRevision.snapshot).filter(
+            ConsultationRevision.consultation_id == consultation.id,
+            ConsultationRevision.version >= version,
+            ConsultationRevision.snapshot.isnot(None)
+        ).order_by(ConsultationRevision.version).first()
+
+        if start:
+            values, resolved = start.snapshot, start.version
+        else:
+            values, resolved = consultation.editable_values(), consultation.version
+
+        steps = self.db.query(ConsultationRevision.base_version, ConsultationRevision.changes).filter(
+            ConsultationRevision.consultation_id == consultation.id,
+            ConsultationRevision.version > version,
+            ConsultationRevision.version <= resolved
+        ).order_by(ConsultationRevision.version.desc()).all()
+
+        for step in steps:
+            if step.base_version is None:
+                return None
+            values = apply_patch(values, step.changes, Consultation.EDITABLE_FIELDS)
+            resolved = step.base_version
+
+        return values, resolved
+
+    def version_at(self, consultation, moment):
+        """
+        Version that was current at `moment`, or None if the consultation
+        did not exist yet
+        """
+        from models.exam import ConsultationRevision
+
+        if consultation.created_at and moment < consultation.created_at:
+            return None
+
+        version = self.db.query(ConsultationRevision.version).filter(
+            ConsultationRevision.consultation_id == consultation.id,
+            ConsultationRevision.updated_at <= moment
+        ).order_by(ConsultationRevision.version.desc()).limit(1).scalar()
+
+        if version is not None:
+            return version
+
+        # Before the first recorded revision the consultation was at its base version
+        first = self.db.query(ConsultationRevision.base_version, ConsultationRevision.version).filter(
+            ConsultationRevision.consultation_id == consultation.id
+        ).order_by(ConsultationRevision.version).first()
+
+        if not first:
+            return consultation.version
+        return first.base_version or first.version
@@ -0,0 +1,150 @@
+"""
+Password hashing off the request threads.
+bcrypt runs in a small per-worker process pool so a login burst cannot
+occupy every web worker's CPU. Pending jobs are bounded: when the queue is
+full the caller gets PasswordHasherBusy (503) instead of waiting behind it.
+Werkzeug PBKDF2/scrypt hashes from before the switch still verify and are
+replaced with bcrypt on the next successful login.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUNDS = 12
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 32
+TIMEOUT = 10
+
+# bcrypt only reads the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full"""
+
+def _hash_password(password, rounds):
+    import bcrypt
+
+    return bcrypt.hashpw(password.encode('utf-8')[:BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds)).decode('ascii')
+
+def _verify_password(password, password_hash):
+    if password_hash.startswith(('$2a$', '$2b$', '$2y$')):
+        import bcrypt
+
+        return bcrypt.checkpw(password.encode('utf-8')[:BCRYPT_MAX_BYTES], password_hash.encode('ascii'))
+
+    from werkzeug.security import check_password_hash
+
+    return check_password_hash(password_hash, password)
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.rounds = DEFAULT_ROUNDS
+        self.workers = DEFAULT_WORKERS
+        self.queue_size = DEFAULT_QUEUE_SIZE
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._pending = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['password_hasher'] = self
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', DEFAULT_ROUNDS)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+        self.queue_size = app.config.get('PASSWORD_HASH_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        app.register_error_handler(PasswordHasherBusy, self._busy_response)
+
+    @staticmethod
+    def _busy_response(error):
+        from flask import jsonify
+
+        response = jsonify({'error': 'Server busy, try again shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+
+    @property
+    def queue_depth(self):
+        """Hashing jobs submitted and not yet finished in this worker"""
+        return self._pending
+
+    @staticmethod
+    def _mp_context():
+        """
+        Start method for the pool. Web workers are multithreaded (gthread), so
+        children are never forked from them directly: a forkserver (or spawn
+        on Windows) starts them from a clean process that preloads only this
+        module, not the application's __main__.
+        """
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload([__name__])
+            return context
+        return multiprocessing.get_context('spawn')
+
+    def _get_executor(self):
+        # Created lazily in each worker; a pool inherited across fork is unusable
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._mp_context())
+                self._pid = os.getpid()
+            return self._executor
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            logger.warning('Password hashing queue full (%d pending)', self._pending)
+            raise PasswordHasherBusy()
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+
+        # The slot is held until the job itself finishes, even if this request gives up on it
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning('Password hashing timed out after %ss (%d pending)', TIMEOUT, self._pending)
+            raise PasswordHasherBusy()
+        except BrokenProcessPool:
+            logger.exception('Password hashing pool died, recreating it')
+            with self._lock:
+                self._executor = None
+            raise PasswordHasherBusy()
+
+    def hash(self, password):
+        return self._run(_hash_password, password, self.rounds)
+
+    def verify(self, password, password_hash):
+        if not password_hash:
+            return False
+        return self._run(_verify_password, password, password_hash)
+
+    def needs_rehash(self, password_hash):
+        """True for non-bcrypt hashes and bcrypt hashes with a different cost"""
+        parts = (password_hash or '').split('$')
+        if len(parts) < 4 or parts[1] not in ('2a', '2b', '2y'):
+            return True
+        return parts[2] != f'{self.rounds:02d}'
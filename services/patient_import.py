@@ -0,0 +1,321 @@
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from utils.normalization import normalize_cpf
+from utils.phonetic import phonetic_tokens
+
+# Accepted header names (English and the Portuguese used in clinic spreadsheets)
+COLUMN_ALIASES = {
+    'tutor_name': ['tutor_name', 'tutor', 'nome_tutor', 'tutor_nome'],
+    'tutor_cpf': ['tutor_cpf', 'cpf', 'cpf_tutor'],
+    'tutor_phone': ['tutor_phone', 'phone', 'telefone', 'celular'],
+    'tutor_email': ['tutor_email', 'email', 'e-mail'],
+    'tutor_address': ['tutor_address', 'address', 'endereco', 'endereço'],
+    'animal_name': ['animal_name', 'animal', 'nome_animal', 'paciente'],
+    'species': ['species', 'especie', 'espécie'],
+    'breed': ['breed', 'raca', 'raça'],
+    'birth_date': ['birth_date', 'nascimento', 'data_nascimento'],
+    'sex': ['sex', 'sexo'],
+    'weight': ['weight', 'peso'],
+    'is_neutered': ['is_neutered', 'castrado', 'neutered'],
+    'microchip': ['microchip', 'chip'],
+    'notes': ['notes', 'observacoes', 'observações', 'obs'],
+}
+
+REQUIRED_COLUMNS = ['tutor_name', 'tutor_cpf', 'animal_name', 'species']
+
+MAX_LENGTHS = {
+    'tutor_name': 255,
+    'tutor_phone': 20,
+    'tutor_email': 255,
+    'animal_name': 255,
+    'species': 50,
+    'breed': 100,
+    'sex': 10,
+    'microchip': 50,
+}
+
+# Stop collecting row errors after this many, the import still runs
+MAX_REPORTED_ERRORS = 1000
+
+STAGING_COLUMNS = [
+    'row_number', 'tutor_name', 'tutor_cpf', 'cpf_digits', 'tutor_phone', 'tutor_email',
+    'tutor_address', 'tutor_phonetic', 'animal_name', 'animal_phonetic', 'species', 'breed',
+    'birth_date', 'sex', 'weight', 'is_neutered', 'microchip', 'notes'
+]
+
+STAGING_TABLE_SQL = """
+    CREATE TEMP TABLE import_patients (
+        row_number integer NOT NULL,
+        tutor_name varchar(255) NOT NULL,
+        tutor_cpf varchar(14) NOT NULL,
+        cpf_digits varchar(11) NOT NULL,
+        tutor_phone varchar(20),
+        tutor_email varchar(255),
+        tutor_address text,
+        tutor_phonetic varchar(32)[],
+        animal_name varchar(255) NOT NULL,
+        animal_phonetic varchar(32)[],
+        species varchar(50) NOT NULL,
+        breed varchar(100),
+        birth_date date,
+        sex varchar(10),
+        weight numeric(5, 2),
+        is_neutered boolean,
+        microchip varchar(50),
+        notes text
+    ) ON COMMIT DROP
+"""
+
+# One existing tutor per CPF (the oldest, if duplicates slipped in)
+TUTOR_MATCH_SQL = """
+    SELECT DISTINCT ON (cpf_digits) id, cpf_digits
+    FROM tutors
+    WHERE cpf_digits IN (SELECT cpf_digits FROM import_patients)
+    ORDER BY cpf_digits, created_at
+"""
+
+UPDATE_TUTORS_SQL = f"""
+    WITH src AS (
+        SELECT DISTINCT ON (cpf_digits) * FROM import_patients ORDER BY cpf_digits, row_number
+    ), matched AS ({TUTOR_MATCH_SQL})
+    UPDATE tutors t SET
+        phone = COALESCE(NULLIF(t.phone, ''), src.tutor_phone),
+        email = COALESCE(NULLIF(t.email, ''), src.tutor_email),
+        address = COALESCE(NULLIF(t.address, ''), src.tutor_address),
+        updated_at = now()
+    FROM src JOIN matched ON matched.cpf_digits = src.cpf_digits
+    WHERE t.id = matched.id
+"""
+
+INSERT_TUTORS_SQL = f"""
+    WITH src AS (
+        SELECT DISTINCT ON (cpf_digits) * FROM import_patients ORDER BY cpf_digits, row_number
+    ), matched AS ({TUTOR_MATCH_SQL})
+    INSERT INTO tutors (id, name, cpf, phone, email, address, name_phonetic, created_at, updated_at)
+    SELECT gen_random_uuid(), src.tutor_name, src.tutor_cpf, src.tutor_phone, src.tutor_email,
+           src.tutor_address, src.tutor_phonetic, now(), now()
+    FROM src
+    WHERE NOT EXISTS (SELECT 1 FROM matched WHERE matched.cpf_digits = src.cpf_digits)
+"""
+
+# Animals are matched on (tutor, name, species), case-insensitively
+ANIMAL_SOURCE_SQL = f"""
+    SELECT DISTINCT ON (s.cpf_digits, lower(s.animal_name), lower(s.species))
+           s.*, matched.id AS tutor_id
+    FROM import_patients s
+    JOIN ({TUTOR_MATCH_SQL}) matched ON matched.cpf_digits = s.cpf_digits
+    ORDER BY s.cpf_digits, lower(s.animal_name), lower(s.species), s.row_number
+"""
+
+UPDATE_ANIMALS_SQL = f"""
+    WITH src AS ({ANIMAL_SOURCE_SQL})
+    UPDATE animals a SET
+        breed = COALESCE(NULLIF(a.breed, ''), src.breed),
+        birth_date = COALESCE(a.birth_date, src.birth_date),
+        sex = COALESCE(NULLIF(a.sex, ''), src.sex),
+        weight = COALESCE(a.weight, src.weight),
+        is_neutered = COALESCE(src.is_neutered, a.is_neutered),
+        microchip = COALESCE(NULLIF(a.microchip, ''), src.microchip),
+        notes = COALESCE(NULLIF(a.notes, ''), src.notes),
+        updated_at = now()
+    FROM src
+    WHERE a.tutor_id = src.tutor_id
+      AND lower(a.name) = lower(src.animal_name)
+      AND lower(a.species) = lower(src.species)
+"""
+
+INSERT_ANIMALS_SQL = f"""
+    WITH src AS ({ANIMAL_SOURCE_SQL})
+    INSERT INTO animals (id, tutor_id, name, species, breed, birth_date, sex, weight,
+                         is_neutered, microchip, notes, name_phonetic, created_at, updated_at)
+    SELECT gen_random_uuid(), src.tutor_id, src.animal_name, src.species, src.breed, src.birth_date,
+           src.sex, src.weight, COALESCE(src.is_neutered, false), src.microchip, src.notes,
+           src.animal_phonetic, now(), now()
+    FROM src
+    WHERE NOT EXISTS (
+        SELECT 1 FROM animals a
+        WHERE a.tutor_id = src.tutor_id
+          AND lower(a.name) = lower(src.animal_name)
+          AND lower(a.species) = lower(src.species)
+    )
+"""
+
+AFFECTED_TUTORS_SQL = f"""
+    SELECT DISTINCT matched.id
+    FROM ({TUTOR_MATCH_SQL}) matched
+    JOIN import_patients s ON s.cpf_digits = matched.cpf_digits
+"""
+
+# Animals that got a weight from the import start their weight history with it
+INSERT_WEIGHTS_SQL = f"""
+    INSERT INTO animal_weights (id, animal_id, weight, measured_at, created_at, updated_at)
+    SELECT gen_random_uuid(), a.id, a.weight, now(), now(), now()
+    FROM animals a
+    JOIN ({AFFECTED_TUTORS_SQL}) affected ON affected.id = a.tutor_id
+    WHERE a.weight IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM animal_weights w WHERE w.animal_id = a.id)
+"""
+
+def _resolve_columns(header):
+    """Map the file's header to canonical column names"""
+    lookup = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            lookup[alias] = canonical
+
+    return [lookup.get(name.strip().lower()) for name in header]
+
+def _parse_date(value):
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError('invalid date (use YYYY-MM-DD or DD/MM/YYYY)')
+
+def _parse_weight(value):
+    try:
+        weight = Decimal(value.replace(',', '.'))
+    except InvalidOperation:
+        raise ValueError('invalid weight')
+    if not weight.is_finite() or weight <= 0 or weight >= 1000:
+        raise ValueError('weight must be between 0 and 999.99')
+    return weight.quantize(Decimal('0.01'))
+
+def _parse_bool(value):
+    lowered = value.lower()
+    if lowered in ('1', 'true', 'sim', 's', 'yes', 'y'):
+        return True
+    if lowered in ('0', 'false', 'nao', 'não', 'n', 'no'):
+        return False
+    raise ValueError('invalid boolean (use sim/não)')
+
+def format_cpf(digits):
+    """Canonical CPF format used for imported tutors (123.456.789-00)"""
+    return f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:]}"
+
+def validate_row(values):
+    """
+    Validate one CSV row (canonical column -> raw text).
+    Returns (staging_row, errors); staging_row is None when the row is invalid.
+    """
+    errors = []
+    clean = {key: (value or '').strip() for key, value in values.items()}
+
+    for column in REQUIRED_COLUMNS:
+        if not clean.get(column):
+            errors.append(f'{column} is required')
+
+    for column, max_length in MAX_LENGTHS.items():
+        if len(clean.get(column, '')) > max_length:
+            errors.append(f'{column} is longer than {max_length} characters')
+
+    cpf_digits = normalize_cpf(clean.get('tutor_cpf'))
+    if clean.get('tutor_cpf') and len(cpf_digits) != 11:
+        errors.append('tutor_cpf must have 11 digits')
+
+    parsed = {}
+    for column, parser in (('birth_date', _parse_date), ('weight', _parse_weight), ('is_neutered', _parse_bool)):
+        if clean.get(column):
+            try:
+                parsed[column] = parser(clean[column])
+            except ValueError as e:
+                errors.append(f'{column}: {e}')
+
+    if errors:
+        return None, errors
+
+    def optional(column):
+        return clean.get(column) or None
+
+    return {
+        'tutor_name': clean['tutor_name'],
+        'tutor_cpf': format_cpf(cpf_digits),
+        'cpf_digits': cpf_digits,
+        'tutor_phone': optional('tutor_phone'),
+        'tutor_email': clean.get('tutor_email', '').lower() or None,
+        'tutor_address': optional('tutor_address'),
+        'tutor_phonetic': phonetic_tokens(clean['tutor_name']),
+        'animal_name': clean['animal_name'],
+        'animal_phonetic': phonetic_tokens(clean['animal_name']),
+        'species': clean['species'],
+        'breed': optional('breed'),
+        'birth_date': parsed.get('birth_date'),
+        'sex': optional('sex'),
+        'weight': parsed.get('weight'),
+        'is_neutered': parsed.get('is_neutered'),
+        'microchip': optional('microchip'),
+        'notes': optional('notes'),
+    }, []
+
+class PatientImportService:
+    def __init__(self, db_session):
+        self.db = db_session
+
+    def run(self, text_stream):
+        """
+        Import tutors and animals from a CSV text stream.
+        Rows are validated while streaming and staged with COPY; tutors and
+        animals are then upserted set-wise. Does not commit.
+        Returns the import report.
+        """
+        from sqlalchemy import text
+        from services import search_index
+
+        header_line = text_stream.readline()
+        if not header_line.strip():
+            raise ValueError('CSV file is empty')
+
+        # Brazilian spreadsheets usually export with ';'
+        delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+        header = next(csv.reader([header_line], delimiter=delimiter))
+        columns = _resolve_columns(header)
+
+        missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            raise ValueError(f'Missing required columns: {", ".join(missing)}')
+
+        report = {'rows': 0, 'valid_rows': 0, 'errors': [], 'errors_truncated': False}
+
+        connection = self.db.connection()
+        raw_connection = connection.connection.driver_connection
+
+        with raw_connection.cursor() as cursor:
+            cursor.execute(STAGING_TABLE_SQL)
+
+            copy_sql = f"COPY import_patients ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+            with cursor.copy(copy_sql) as copy:
+                # Line 1 is the header
+                for row_number, fields in enumerate(csv.reader(text_stream, delimiter=delimiter), start=2):
+                    if not any(field.strip() for field in fields):
+                        continue
+
+                    report['rows'] += 1
+                    values = {c: v for c, v in zip(columns, fields) if c}
+                    staged, errors = validate_row(values)
+
+                    if errors:
+                        if len(report['errors']) < MAX_REPORTED_ERRORS:
+                            report['errors'].append({'row': row_number, 'errors': errors})
+                        else:
+                            report['errors_truncated'] = True
+                        continue
+
+                    staged['row_number'] = row_number
+                    copy.write_row([staged[c] for c in STAGING_COLUMNS])
+                    report['valid_rows'] += 1
+
+        if report['valid_rows']:
+            report['tutors_updated'] = connection.execute(text(UPDATE_TUTORS_SQL)).rowcount
+            report['tutors_created'] = connection.execute(text(INSERT_TUTORS_SQL)).rowcount
+            report['animals_updated'] = connection.execute(text(UPDATE_ANIMALS_SQL)).rowcount
+            report['animals_created'] = connection.execute(text(INSERT_ANIMALS_SQL)).rowcount
+            connection.execute(text(INSERT_WEIGHTS_SQL))
+
+            tutor_ids = [row.id for row in connection.execute(text(AFFECTED_TUTORS_SQL))]
+            search_index.reindex(connection, 'tutor', tutor_ids)
+        else:
+            report.update(tutors_updated=0, tutors_created=0, animals_updated=0, animals_created=0)
+
+        return report
@@ -0,0 +1,92 @@
+"""
+Rate limits for anonymous endpoints (login and the public portal).
+Each named limit is a set of token buckets keyed by client IP and by the
+submitted email or CPF. A request is refused with 429 before the view runs,
+so no password hash or query is spent on it. Buckets live in this process
+unless RATE_LIMIT_STORAGE_URL points at a shared store.
+"""
+
+import logging
+import math
+from functools import wraps
+from flask import request, jsonify
+from utils.normalization import normalize_cpf, normalize_email
+from utils.rate_limit import create_bucket_store
+
+logger = logging.getLogger(__name__)
+
+# name -> [(key, capacity, period in seconds)]
+LIMITS = {
+    'login': [('ip', 20, 60), ('email', 5, 300)],
+    'portal': [('ip', 30, 60), ('cpf', 10, 300)],
+    'portal-token': [('ip', 120, 60)],
+}
+
+def _client_ip():
+    return request.remote_addr
+
+def _email():
+    data = request.get_json(silent=True)
+    return normalize_email(data.get('email')) if isinstance(data, dict) and isinstance(data.get('email'), str) else ''
+
+def _cpf():
+    data = request.get_json(silent=True)
+    return normalize_cpf(data.get('cpf')) if isinstance(data, dict) and isinstance(data.get('cpf'), str) else ''
+
+KEY_FUNCTIONS = {
+    'ip': _client_ip,
+    'email': _email,
+    'cpf': _cpf,
+}
+
+class RateLimiter:
+    def __init__(self, app=None):
+        self.store = None
+        self.enabled = True
+        self.limits = dict(LIMITS)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['rate_limiter'] = self
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.limits.update(app.config.get('RATE_LIMITS', {}))
+        self.store = create_bucket_store(app.config.get('RATE_LIMIT_STORAGE_URL'))
+
+    def check(self, name):
+        """
+        Take one token from every bucket of the named limit.
+
+        Returns:
+            Seconds to wait when any bucket is empty, otherwise 0
+        """
+        retry_after = 0.0
+        for key_name, capacity, period in self.limits[name]:
+            value = KEY_FUNCTIONS[key_name]()
+            if not value:
+                continue
+            try:
+                allowed, wait = self.store.take(f'{name}:{key_name}:{value}', capacity, period)
+            except Exception as e:
+                # A shared store outage must not take the endpoints down with it
+                logger.warning('Rate limit store unavailable: %s', e)
+                return 0.0
+            if not allowed:
+                retry_after = max(retry_after, wait)
+        return retry_after
+
+    def limit(self, name):
+        """Decorator refusing requests over the named limit with 429"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.enabled and self.store is not None:
+                    retry_after = self.check(name)
+                    if retry_after:
+                        response = jsonify({'error': 'Too many requests'})
+                        response.status_code = 429
+                        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                        return response
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
@@ -0,0 +1,59 @@
+"""
+Per-worker cache of public portal responses.
+Keyed by (access code, CPF digits); holds the serialised response so a
+repeat hit costs no query and no serialisation. Failed lookups are cached
+briefly. Entries are evicted when the exam result or its images change in
+this worker; other workers converge within POSITIVE_TTL.
+"""
+
+from sqlalchemy import event
+from utils.cache import TTLCache
+
+MAX_ENTRIES = 4096
+POSITIVE_TTL = 120
+NEGATIVE_TTL = 30
+
+class PublicResultCache:
+    def __init__(self, app=None):
+        self.cache = TTLCache(MAX_ENTRIES, POSITIVE_TTL)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from models.exam import ExamResult, ExamImage
+
+        app.extensions['result_cache'] = self
+        for model, listener in ((ExamResult, self._evict_result), (ExamImage, self._evict_image)):
+            for name in ('after_update', 'after_delete'):
+                if not event.contains(model, name, listener):
+                    event.listen(model, name, listener)
+        if not event.contains(ExamImage, 'after_insert', self._evict_image):
+            event.listen(ExamImage, 'after_insert', self._evict_image)
+
+    def get(self, access_code, cpf):
+        """Returns the cached entry dict or None"""
+        hit, entry = self.cache.get((access_code, cpf))
+        return entry if hit else None
+
+    def store(self, access_code, cpf, status, body, exam_result_id=None, exam_type=None):
+        entry = {
+            'status': status,
+            'body': body,
+            'exam_result_id': exam_result_id,
+            'exam_type': exam_type
+        }
+        self.cache.set((access_code, cpf), entry, POSITIVE_TTL if status == 200 else NEGATIVE_TTL)
+        return entry
+
+    def evict(self, exam_result_id=None, access_code=None):
+        """Drop cached responses for an exam result (by id and/or access code)"""
+        return self.cache.delete_where(
+            lambda key, entry: (exam_result_id is not None and entry['exam_result_id'] == exam_result_id)
+            or (access_code is not None and key[0] == access_code)
+        )
+
+    def _evict_result(self, mapper, connection, target):
+        self.evict(target.id, (target.access_code or '').upper())
+
+    def _evict_image(self, mapper, connection, target):
+        self.evict(target.exam_result_id)
@@ -0,0 +1,222 @@
+"""
+Unified admin search index.
+Keeps the search_index table in sync with tutors, animals, users, clinics,
+consultations and exam results, and answers ranked prefix searches over it.
+"""
+
+import re
+from collections import defaultdict
+from sqlalchemy import event, text, bindparam, func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+
+# Each source yields (entity_id, title, subtitle, terms, extra_terms).
+# "terms" are ranked above "extra_terms"; identifiers are stored as bare digits.
+SOURCES = {
+    'tutor': ("""
+        SELECT t.id, t.name,
+               concat_ws(' · ', 'CPF ' || t.cpf, t.phone, t.email),
+               concat_ws(' ', t.name, t.cpf_digits, t.email),
+               concat_ws(' ', regexp_replace(t.phone, '\\D', '', 'g'), t.address)
+        FROM tutors t
+    """, 't.id'),
+    'animal': ("""
+        SELECT a.id, a.name,
+               concat_ws(' · ', a.species, a.breed, 'Microchip ' || nullif(a.microchip, ''), 'Tutor: ' || t.name),
+               concat_ws(' ', a.name, a.microchip),
+               concat_ws(' ', a.species, a.breed, t.name)
+        FROM animals a
+        JOIN tutors t ON t.id = a.tutor_id
+    """, 'a.id'),
+    'user': ("""
+        SELECT u.id, u.name,
+               concat_ws(' · ', u.email, u.role),
+               concat_ws(' ', u.name, u.email),
+               u.role
+        FROM users u
+    """, 'u.id'),
+    'clinic': ("""
+        SELECT c.id, c.name,
+               concat_ws(' · ', c.email, c.phone),
+               concat_ws(' ', c.name, c.email),
+               concat_ws(' ', regexp_replace(c.phone, '\\D', '', 'g'), c.address)
+        FROM clinics c
+    """, 'c.id'),
+    'consultation': ("""
+        SELECT c.id, coalesce(c.diagnosis, c.chief_complaint, 'Consulta'),
+               concat_ws(' · ', a.name, to_char(ap.datetime, 'DD/MM/YYYY HH24:MI')),
+               concat_ws(' ', left(c.diagnosis, 500), left(c.chief_complaint, 500)),
+               a.name
+        FROM consultations c
+        JOIN appointments ap ON ap.id = c.appointment_id
+        JOIN animals a ON a.id = ap.animal_id
+    """, 'c.id'),
+    'exam_result': ("""
+        SELECT e.id, concat_ws(' · ', e.exam_type, e.access_code),
+               concat_ws(' · ', a.name, to_char(e.exam_date, 'DD/MM/YYYY')),
+               concat_ws(' ', e.access_code, e.exam_type),
+               a.name
+        FROM exam_results e
+        JOIN animals a ON a.id = e.animal_id
+    """, 'e.id'),
+}
+
+# Entries that show data from another entity and must follow its changes:
+# entity type -> [(dependent type, query for the dependent ids of :ids)]
+DEPENDENTS = {
+    'tutor': [
+        ('animal', "SELECT id FROM animals WHERE tutor_id = ANY(:ids)"),
+    ],
+    'animal': [
+        ('exam_result', "SELECT id FROM exam_results WHERE animal_id = ANY(:ids)"),
+        ('consultation', """
+            SELECT c.id FROM consultations c
+            JOIN appointments ap ON ap.id = c.appointment_id
+            WHERE ap.animal_id = ANY(:ids)
+        """),
+    ],
+}
+
+TABLE_TYPES = {
+    'tutors': 'tutor',
+    'animals': 'animal',
+    'users': 'user',
+    'clinics': 'clinic',
+    'consultations': 'consultation',
+    'exam_results': 'exam_result',
+}
+
+def _upsert_sql(entity_type, where=None):
+    source, _ = SOURCES[entity_type]
+    if where:
+        source = f"{source} WHERE {where}"
+    return f"""
+        INSERT INTO search_index (entity_type, entity_id, title, subtitle, terms, extra_terms, updated_at)
+        SELECT '{entity_type}', src.*, now()
+        FROM ({source}) AS src
+        ON CONFLICT (entity_type, entity_id) DO UPDATE SET
+            title = EXCLUDED.title,
+            subtitle = EXCLUDED.subtitle,
+            terms = EXCLUDED.terms,
+            extra_terms = EXCLUDED.extra_terms,
+            updated_at = EXCLUDED.updated_at
+    """
+
+def _ids_param(statement):
+    return statement.bindparams(bindparam('ids', type_=ARRAY(UUID(as_uuid=True))))
+
+def reindex(connection, entity_type, ids=None):
+    """
+    Refresh search entries of one entity type set-wise, then of the
+    entries that display its data (DEPENDENTS).
+
+    Args:
+        connection: SQLAlchemy connection (inside the caller's transaction)
+        entity_type: Key of SOURCES
+        ids: Only refresh these ids (all rows when None)
+    """
+    if ids is None:
+        connection.execute(text(_upsert_sql(entity_type)))
+        return
+
+    ids = list(ids)
+    if not ids:
+        return
+
+    column = SOURCES[entity_type][1]
+    connection.execute(_ids_param(text(_upsert_sql(entity_type, f"{column} = ANY(:ids)"))), {'ids': ids})
+
+    for dependent_type, dependent_sql in DEPENDENTS.get(entity_type, []):
+        dependent_ids = connection.execute(_ids_param(text(dependent_sql)), {'ids': ids}).scalars().all()
+        reindex(connection, dependent_type, dependent_ids)
+
+def remove(connection, entity_type, ids):
+    """Drop search entries of deleted entities"""
+    ids = list(ids)
+    if not ids:
+        return
+
+    statement = _ids_param(text(
+        "DELETE FROM search_index WHERE entity_type = :entity_type AND entity_id = ANY(:ids)"
+    ))
+    connection.execute(statement, {'entity_type': entity_type, 'ids': ids})
+
+def rebuild(connection):
+    """Rebuild the whole index (e.g. after seeding or bulk SQL changes)"""
+    connection.execute(text("DELETE FROM search_index"))
+    for entity_type in SOURCES:
+        reindex(connection, entity_type)
+
+def _after_flush(session, flush_context):
+    changed = defaultdict(set)
+    removed = defaultdict(set)
+
+    for obj in session.new | session.dirty:
+        entity_type = TABLE_TYPES.get(getattr(obj, '__tablename__', None))
+        if entity_type and session.is_modified(obj):
+            changed[entity_type].add(obj.id)
+
+    for obj in session.deleted:
+        entity_type = TABLE_TYPES.get(getattr(obj, '__tablename__', None))
+        if entity_type:
+            removed[entity_type].add(obj.id)
+
+    if not changed and not removed:
+        return
+
+    connection = session.connection()
+    for entity_type, ids in removed.items():
+        remove(connection, entity_type, ids)
+    for entity_type, ids in changed.items():
+        reindex(connection, entity_type, ids - removed[entity_type])
+
+def register_search_index_listeners():
+    """Keep search_index in sync with every ORM flush"""
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+
+def _prefix_tsquery(term):
+    """Turn free text into an AND of prefix terms ("ana 123.456" -> "ana:* & 123456:*")"""
+    # Drop separators inside numbers so formatted CPFs/phones match stored digits
+    term = re.sub(r'(?<=\d)[.\-/() ]+(?=\d)', '', term)
+    words = []
+    for word in term.split():
+        word = re.sub(r'[^\w@.\-+]', '', word).strip('.-+@')
+        if word:
+            words.append(f"{word}:*")
+    return ' & '.join(words)
+
+def search(term, types=None, limit=20):
+    """
+    Ranked search over the unified index.
+
+    Args:
+        term: Free text typed by the user
+        types: Optional list of entity types to restrict the results to
+        limit: Maximum number of results
+
+    Returns:
+        List of SearchEntry rows with a `rank` attribute, best match first
+    """
+    from extensions import db
+    from models.search import SearchEntry, INDEX_SEARCH_REGCONFIG
+
+    query_text = _prefix_tsquery(term)
+    if not query_text:
+        return []
+
+    tsquery = func.to_tsquery(INDEX_SEARCH_REGCONFIG, query_text)
+    rank = func.ts_rank(SearchEntry.search_vector, tsquery)
+
+    query = db.session.query(
+        SearchEntry.entity_type,
+        SearchEntry.entity_id,
+        SearchEntry.title,
+        SearchEntry.subtitle,
+        rank.label('rank')
+    ).filter(SearchEntry.search_vector.op('@@')(tsquery))
+
+    if types:
+        query = query.filter(SearchEntry.entity_type.in_(types))
+
+    return query.order_by(rank.desc(), SearchEntry.title).limit(limit).all()
@@ -0,0 +1,164 @@
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+from utils.normalization import normalize_cpf, normalize_phone, normalize_email, normalize_name
+
+# Blocks larger than this are too generic to be useful (e.g. a shared clinic phone)
+MAX_BLOCK_SIZE = 50
+
+# Evidence weights used when scoring a candidate pair
+WEIGHTS = {
+    'cpf': 0.6,
+    'email': 0.25,
+    'phone': 0.2,
+    'name': 0.3,
+}
+
+class TutorDeduplicationService:
+    def __init__(self, db_session):
+        self.db = db_session
+
+    def _load_tutors(self):
+        """Load only the columns needed for matching"""
+        from models.patient import Tutor
+
+        rows = self.db.query(
+            Tutor.id, Tutor.name, Tutor.cpf, Tutor.phone, Tutor.email,
+            Tutor.name_phonetic, Tutor.created_at
+        ).all()
+
+        return {
+            row.id: {
+                'id': row.id,
+                'name': row.name,
+                'cpf': row.cpf,
+                'created_at': row.created_at,
+                'norm_name': normalize_name(row.name),
+                'norm_cpf': normalize_cpf(row.cpf),
+                'norm_phone': normalize_phone(row.phone),
+                'norm_email': normalize_email(row.email),
+                'phonetic': row.name_phonetic or [],
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def _blocking_keys(tutor):
+        """Keys that put likely duplicates in the same block"""
+        keys = []
+        if len(tutor['norm_cpf']) == 11:
+            keys.append(f"cpf:{tutor['norm_cpf']}")
+        if tutor['norm_email']:
+            keys.append(f"email:{tutor['norm_email']}")
+        if len(tutor['norm_phone']) >= 8:
+            # Last 8 digits survive missing area codes and the extra mobile 9
+            keys.append(f"phone:{tutor['norm_phone'][-8:]}")
+        if len(tutor['phonetic']) >= 2:
+            keys.append(f"name:{tutor['phonetic'][0]}:{tutor['phonetic'][-1]}")
+        return keys
+
+    @staticmethod
+    def score_pair(a, b):
+        """
+        Score how likely two tutors are the same person (0..1)
+        Returns (score, reasons)
+        """
+        score = 0.0
+        reasons = []
+
+        if a['norm_cpf'] and a['norm_cpf'] == b['norm_cpf']:
+            score += WEIGHTS['cpf']
+            reasons.append('cpf')
+        elif len(a['norm_cpf']) == 11 and len(b['norm_cpf']) == 11:
+            # Two different valid CPFs are two different people
+            score -= WEIGHTS['cpf']
+
+        if a['norm_email'] and a['norm_email'] == b['norm_email']:
+            score += WEIGHTS['email']
+            reasons.append('email')
+
+        if len(a['norm_phone']) >= 8 and a['norm_phone'][-8:] == b['norm_phone'][-8:]:
+            score += WEIGHTS['phone']
+            reasons.append('phone')
+
+        name_similarity = SequenceMatcher(None, a['norm_name'], b['norm_name']).ratio()
+        if name_similarity >= 0.6:
+            score += WEIGHTS['name'] * name_similarity
+            reasons.append('name')
+
+        return max(0.0, min(score, 1.0)), reasons
+
+    def find_candidates(self, threshold=0.5, limit=None):
+        """
+        Find likely duplicate tutor pairs.
+        Only tutors sharing a blocking key are compared, avoiding O(n²) comparisons.
+        """
+        tutors = self._load_tutors()
+
+        blocks = defaultdict(list)
+        for tutor in tutors.values():
+            for key in self._blocking_keys(tutor):
+                blocks[key].append(tutor['id'])
+
+        pairs = set()
+        for ids in blocks.values():
+            if 1 < len(ids) <= MAX_BLOCK_SIZE:
+                pairs.update(tuple(sorted(pair, key=str)) for pair in combinations(ids, 2))
+
+        candidates = []
+        for a_id, b_id in pairs:
+            a, b = tutors[a_id], tutors[b_id]
+            score, reasons = self.score_pair(a, b)
+            if score >= threshold:
+                # Suggest keeping the oldest record
+                keep, duplicate = sorted((a, b), key=lambda t: (t['created_at'] is None, t['created_at'] or 0))
+                candidates.append({
+                    'score': round(score, 3),
+                    'reasons': reasons,
+                    'keep': {'id': str(keep['id']), 'name': keep['name'], 'cpf': keep['cpf']},
+                    'duplicate': {'id': str(duplicate['id']), 'name': duplicate['name'], 'cpf': duplicate['cpf']}
+                })
+
+        candidates.sort(key=lambda c: c['score'], reverse=True)
+        return candidates[:limit] if limit else candidates
+
+    def merge(self, target_id, source_ids):
+        """
+        Merge source tutors into the target tutor.
+        Animals are re-pointed with one bulk UPDATE; missing contact data is
+        copied from the sources; the sources are deleted. Does not commit.
+        Returns the number of animals moved.
+        """
+        from models.patient import Tutor, Animal
+        from services import search_index
+
+        target = self.db.query(Tutor).get(target_id)
+        if not target:
+            raise LookupError('Target tutor not found')
+
+        source_ids = [sid for sid in source_ids if str(sid) != str(target.id)]
+        sources = self.db.query(Tutor).filter(Tutor.id.in_(source_ids)).all()
+        if len(sources) != len(set(map(str, source_ids))):
+            raise LookupError('Source tutor not found')
+
+        for source in sources:
+            target.phone = target.phone or source.phone
+            target.email = target.email or source.email
+            target.address = target.address or source.address
+
+        source_ids = [source.id for source in sources]
+        moved = self.db.query(Animal).filter(Animal.tutor_id.in_(source_ids)).update(
+            {Animal.tutor_id: target.id}, synchronize_session=False
+        )
+
+        # Expunge first so the ORM does not try to orphan the moved animals
+        for source in sources:
+            self.db.expunge(source)
+        self.db.query(Tutor).filter(Tutor.id.in_(source_ids)).delete(synchronize_session=False)
+
+        # Bulk statements bypass the flush listener, keep the search index in step
+        connection = self.db.connection()
+        search_index.remove(connection, 'tutor', source_ids)
+        search_index.reindex(connection, 'tutor', [target.id])
+
+        return moved
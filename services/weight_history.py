@@ -0,0 +1,61 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from utils.downsample import lttb
+
+# Default number of points returned for charts
+DEFAULT_SERIES_POINTS = 120
+
+def _before_flush(session, flush_context, instances):
+    """Append a weight measurement whenever an animal's weight is set or changed"""
+    from models.patient import Animal, AnimalWeight
+
+    # Measurements added explicitly (e.g. at a consultation) take precedence
+    recorded = set()
+    for obj in session.new:
+        if isinstance(obj, AnimalWeight):
+            recorded.add(id(obj.animal) if obj.animal is not None else obj.animal_id)
+
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Animal) or obj.weight is None:
+            continue
+        if id(obj) in recorded or obj.id in recorded:
+            continue
+
+        if obj in session.dirty:
+            history = inspect(obj).attrs.weight.history
+            if not history.added or (history.deleted and history.deleted[0] == history.added[0]):
+                continue
+
+        session.add(AnimalWeight(animal=obj, weight=obj.weight))
+
+def register_weight_history_listeners():
+    """Record weight changes made through the ORM"""
+    if not event.contains(Session, 'before_flush', _before_flush):
+        event.listen(Session, 'before_flush', _before_flush)
+
+class WeightHistoryService:
+    def __init__(self, db_session):
+        self.db = db_session
+
+    def series(self, animal_id, points=DEFAULT_SERIES_POINTS, date_from=None, date_to=None):
+        """
+        Weight series for charts, downsampled with LTTB to at most `points` points.
+        Only (measured_at, weight) pairs are fetched.
+        Returns (total_measurements, [(measured_at, weight), ...]).
+        """
+        from models.patient import AnimalWeight
+
+        query = self.db.query(AnimalWeight.measured_at, AnimalWeight.weight).filter(
+            AnimalWeight.animal_id == animal_id
+        )
+        if date_from:
+            query = query.filter(AnimalWeight.measured_at >= date_from)
+        if date_to:
+            query = query.filter(AnimalWeight.measured_at <= date_to)
+
+        rows = query.order_by(AnimalWeight.measured_at).all()
+
+        series = [(row.measured_at.timestamp(), float(row.weight), row.measured_at) for row in rows]
+        sampled = lttb(series, points)
+
+        return len(rows), [(measured_at, weight) for _, weight, measured_at in sampled]
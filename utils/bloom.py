@@ -0,0 +1,41 @@
+"""
+Compact probabilistic set membership.
+A Bloom filter answers "definitely not present" or "possibly present"
+using a few bits per element.
+"""
+
+import hashlib
+import math
+from typing import Iterable
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Expected number of elements
+            error_rate: Target false positive rate at that capacity
+        """
+        capacity = max(int(capacity), 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, values: Iterable[str]):
+        for value in values:
+            self.add(value)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
@@ -0,0 +1,70 @@
+"""
+Bounded in-process cache with per-entry expiry.
+Least recently used entries are evicted once maxsize is reached.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        """
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time to live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            (hit, value); value is None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Remove every entry for which predicate(key, value) is true.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            doomed = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,183 @@
+"""
+Compact deltas for long text fields.
+Text deltas are lists of {"retain": n}, {"insert": "text"} and {"delete": n}
+operations; document patches are JSON-Patch style lists over flat fields,
+with an extra "text" op that carries a text delta.
+"""
+
+import json
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+class DeltaError(ValueError):
+    """Raised when a delta or patch cannot be applied"""
+
+class PatchTestFailed(DeltaError):
+    """Raised when a JSON-Patch "test" operation does not match"""
+
+def apply_text_delta(text: Optional[str], ops: List[Dict]) -> str:
+    """
+    Apply a text delta.
+
+    Args:
+        text: Current text (None is treated as empty)
+        ops: Delta operations; text after the last op is kept
+
+    Returns:
+        The new text
+    """
+    text = text or ''
+    position = 0
+    parts = []
+
+    if not isinstance(ops, list):
+        raise DeltaError('delta must be a list of operations')
+
+    for op in ops:
+        if not isinstance(op, dict) or len(op) != 1:
+            raise DeltaError(f'invalid delta operation: {op!r}')
+
+        if 'retain' in op:
+            count = op['retain']
+            if not isinstance(count, int) or count < 0 or position + count > len(text):
+                raise DeltaError('retain goes past the end of the text')
+            parts.append(text[position:position + count])
+            position += count
+        elif 'delete' in op:
+            count = op['delete']
+            if not isinstance(count, int) or count < 0 or position + count > len(text):
+                raise DeltaError('delete goes past the end of the text')
+            position += count
+        elif 'insert' in op:
+            if not isinstance(op['insert'], str):
+                raise DeltaError('insert must be a string')
+            parts.append(op['insert'])
+        else:
+            raise DeltaError(f'unknown delta operation: {op!r}')
+
+    parts.append(text[position:])
+    return ''.join(parts)
+
+def diff_text(old: Optional[str], new: Optional[str]) -> List[Dict]:
+    """
+    Build the delta that turns `old` into `new`.
+
+    Args:
+        old: Source text
+        new: Target text
+
+    Returns:
+        Delta operations (empty list when the texts are equal)
+    """
+    old, new = old or '', new or ''
+
+    # Typical edits touch one spot, trim the common ends before diffing
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+
+    old_middle = old[prefix:len(old) - suffix]
+    new_middle = new[prefix:len(new) - suffix]
+
+    ops = []
+
+    def push(kind, value):
+        if ops and kind in ops[-1]:
+            ops[-1][kind] += value
+        else:
+            ops.append({kind: value})
+
+    if prefix:
+        push('retain', prefix)
+
+    matcher = SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            push('retain', i2 - i1)
+        if tag in ('replace', 'delete'):
+            push('delete', i2 - i1)
+        if tag in ('replace', 'insert'):
+            push('insert', new_middle[j1:j2])
+
+    # Trailing retains are implicit
+    while ops and 'retain' in ops[-1]:
+        ops.pop()
+    return ops
+
+def apply_patch(values: Dict, patch: List[Dict], fields) -> Dict:
+    """
+    Apply a JSON-Patch style document patch to flat field values.
+
+    Supported ops: replace/add (set a field), remove (set to null),
+    test (assert a value) and text (apply a text delta to a field).
+
+    Args:
+        values: Current field values
+        patch: List of operations with a "/field" path
+        fields: Field names that may be changed
+
+    Returns:
+        New field values (the input dict is not modified)
+    """
+    result = dict(values)
+
+    if not isinstance(patch, list):
+        raise DeltaError('patch must be a list of operations')
+
+    for op in patch:
+        if not isinstance(op, dict):
+            raise DeltaError(f'invalid patch operation: {op!r}')
+
+        field = str(op.get('path', '')).lstrip('/')
+        if field not in fields:
+            raise DeltaError(f"path '{op.get('path')}' is not editable")
+
+        kind = op.get('op')
+        if kind in ('replace', 'add'):
+            if 'value' not in op:
+                raise DeltaError(f'{kind} requires a value')
+            if op['value'] is not None and not isinstance(op['value'], str):
+                raise DeltaError(f"value for '{op.get('path')}' must be a string or null")
+            result[field] = op['value']
+        elif kind == 'remove':
+            result[field] = None
+        elif kind == 'test':
+            if result.get(field) != op.get('value'):
+                raise PatchTestFailed(f"test failed for '{op.get('path')}'")
+        elif kind == 'text':
+            result[field] = apply_text_delta(result.get(field), op.get('delta'))
+        else:
+            raise DeltaError(f'unsupported patch operation: {kind!r}')
+
+    return result
+
+def diff_values(current: Dict, target: Dict) -> List[Dict]:
+    """
+    Build the smallest patch that turns `current` into `target`.
+    Text fields use a delta when it is smaller than the full value.
+
+    Args:
+        current: Field values to start from
+        target: Field values to arrive at
+
+    Returns:
+        Patch operations (empty list when nothing differs)
+    """
+    patch = []
+    for field in target:
+        old, new = current.get(field), target.get(field)
+        if old == new:
+            continue
+
+        replace = {'op': 'replace', 'path': f'/{field}', 'value': new}
+        if isinstance(old, str) and isinstance(new, str):
+            text = {'op': 'text', 'path': f'/{field}', 'delta': diff_text(old, new)}
+            if len(json.dumps(text)) < len(json.dumps(replace)):
+                patch.append(text)
+                continue
+        patch.append(replace)
+    return patch
@@ -0,0 +1,52 @@
+"""
+Downsampling of time series for charts.
+Largest-Triangle-Three-Buckets keeps the visual shape (peaks, drops) of a
+series while returning a fixed number of points.
+"""
+
+from typing import List, Sequence, Tuple
+
+def lttb(points: Sequence[Tuple], threshold: int) -> List[Tuple]:
+    """
+    Downsample (x, y) points with Largest-Triangle-Three-Buckets.
+
+    Args:
+        points: (x, y) points sorted by x; extra tuple items are carried along
+        threshold: Maximum number of points to return (at least 3 to downsample)
+
+    Returns:
+        The selected points, always including the first and last
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_points = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_points) / len(next_points)
+        avg_y = sum(p[1] for p in next_points) / len(next_points)
+
+        ax, ay = points[selected][0], points[selected][1]
+        best_area = -1.0
+        for index in range(start, end):
+            bx, by = points[index][0], points[index][1]
+            area = abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                selected_candidate = index
+
+        selected = selected_candidate
+        sampled.append(points[selected])
+
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,96 @@
+"""
+Image file metadata without third-party dependencies.
+Dimensions are read from the file header of PNG, GIF, JPEG, BMP and WebP images.
+"""
+
+import hashlib
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+def image_dimensions(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from an image header.
+
+    Args:
+        path: Path of the image file
+
+    Returns:
+        (width, height), or None if the format is not recognised
+    """
+    with open(path, 'rb') as f:
+        head = f.read(32)
+
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+
+        if head.startswith(b'BM') and len(head) >= 26:
+            width, height = struct.unpack('<ii', head[18:26])
+            return width, abs(height)
+
+        if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8X':
+                return (int.from_bytes(head[24:27], 'little') + 1,
+                        int.from_bytes(head[27:30], 'little') + 1)
+            f.seek(20)
+            data = f.read(10)
+            if chunk == b'VP8 ' and len(data) == 10:
+                width, height = struct.unpack('<HH', data[6:10])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L' and len(data) >= 5:
+                bits = int.from_bytes(data[1:5], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            return None
+
+        if head.startswith(b'\xff\xd8'):
+            # Walk the JPEG segments up to the start-of-frame marker
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                    continue
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    return None
+                length = struct.unpack('>H', length_bytes)[0]
+                if length < 2:
+                    return None
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    frame = f.read(5)
+                    if len(frame) < 5:
+                        return None
+                    height, width = struct.unpack('>HH', frame[1:5])
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+
+    return None
+
+def describe_image(path: str) -> Dict:
+    """
+    Collect size, checksum and dimensions of an image file.
+
+    Args:
+        path: Path of the image file
+
+    Returns:
+        Dict with size_bytes, checksum (SHA-256 hex), width and height
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+
+    dimensions = image_dimensions(path)
+
+    return {
+        'size_bytes': os.path.getsize(path),
+        'checksum': digest.hexdigest(),
+        'width': dimensions[0] if dimensions else None,
+        'height': dimensions[1] if dimensions else None
+    }
@@ -0,0 +1,63 @@
+"""
+Normalization helpers for tutor identifiers.
+Formatted and unformatted values (123.456.789-00 vs 12345678900) compare equal.
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+def normalize_cpf(cpf: Optional[str]) -> str:
+    """
+    Reduce a CPF to its digits.
+
+    Args:
+        cpf: CPF in any format
+
+    Returns:
+        Digits only (empty string when missing)
+    """
+    return re.sub(r'\D', '', cpf or '')
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Reduce a Brazilian phone number to area code + number digits.
+
+    Args:
+        phone: Phone in any format, with or without +55 / leading 0
+
+    Returns:
+        Digits only, without country code or trunk prefix
+    """
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) > 11 and digits.startswith('55'):
+        digits = digits[2:]
+    if len(digits) > 10 and digits.startswith('0'):
+        digits = digits[1:]
+    return digits
+
+def normalize_email(email: Optional[str]) -> str:
+    """
+    Case- and whitespace-insensitive form of an email address.
+
+    Args:
+        email: Email as typed
+
+    Returns:
+        Lower-cased, trimmed email (empty string when missing)
+    """
+    return (email or '').strip().lower()
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Accent- and case-insensitive form of a person's name.
+
+    Args:
+        name: Name as typed
+
+    Returns:
+        Lower-case name without accents and with single spaces
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.lower().split())
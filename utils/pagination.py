@@ -0,0 +1,44 @@
+"""
+Opaque keyset cursors.
+A cursor encodes the sort key of the last row on a page, so the next page
+is a range scan from that key instead of an OFFSET over skipped rows.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+def encode_cursor(sort_value: datetime, row_id) -> str:
+    """
+    Encode the (timestamp, id) sort key of the last row on a page.
+
+    Args:
+        sort_value: Timestamp or date the list is ordered by
+        row_id: Row id used as tie-breaker
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f'{sort_value.isoformat()}|{row_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (timestamp, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
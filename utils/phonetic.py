@@ -0,0 +1,87 @@
+"""
+Phonetic keys for Brazilian Portuguese names.
+Lets searches match common misspellings (Tiago/Thiago, Luiz/Luis, Sousa/Souza).
+"""
+
+import re
+import unicodedata
+from typing import List
+
+# Ordered rewrite rules, applied to an upper-case, accent-free token
+_RULES = [
+    (re.compile(r'PH'), 'F'),
+    (re.compile(r'TH'), 'T'),
+    (re.compile(r'SCH|SH|CH'), 'X'),
+    (re.compile(r'LH'), 'L'),
+    (re.compile(r'NH'), 'N'),
+    (re.compile(r'[SX]C(?=[EIY])'), 'S'),
+    (re.compile(r'QU(?=[EIY])'), 'K'),
+    # Lower-case marker so the hard G is not turned into J below
+    (re.compile(r'GU(?=[EIY])'), 'g'),
+    (re.compile(r'C(?=[EIY])'), 'S'),
+    (re.compile(r'[CQ]'), 'K'),
+    (re.compile(r'G(?=[EIY])'), 'J'),
+    (re.compile(r'Y'), 'I'),
+    (re.compile(r'W'), 'V'),
+    (re.compile(r'Z'), 'S'),
+    (re.compile(r'H'), ''),
+    (re.compile(r'M$'), 'N'),
+]
+
+# Name particles carry no identity ("Maria da Silva" == "Maria Silva")
+_PARTICLES = {'DA', 'DAS', 'DE', 'DI', 'DO', 'DOS', 'DU', 'E'}
+
+_DUPLICATES = re.compile(r'(.)\1+')
+_VOWELS = re.compile(r'[AEIOU]')
+
+def _strip_accents(value: str) -> str:
+    # Ç sounds like S, handle it before the cedilla is stripped
+    value = value.upper().replace('Ç', 'S')
+    normalized = unicodedata.normalize('NFKD', value)
+    return ''.join(c for c in normalized if not unicodedata.combining(c))
+
+def phonetic_code(token: str) -> str:
+    """
+    Encode a single word into its phonetic key.
+
+    Args:
+        token: A single word (e.g. a first name)
+
+    Returns:
+        Phonetic key, or an empty string if the word has no letters
+    """
+    word = re.sub(r'[^A-Z]', '', _strip_accents(token))
+    if not word:
+        return ''
+
+    for pattern, replacement in _RULES:
+        word = pattern.sub(replacement, word)
+
+    word = _DUPLICATES.sub(r'\1', word.upper())
+    if not word:
+        return ''
+
+    # Keep the leading sound, drop the (often misspelled) vowels after it
+    return word[0] + _VOWELS.sub('', word[1:])
+
+def phonetic_tokens(text: str) -> List[str]:
+    """
+    Encode every word of a name into phonetic keys.
+
+    Args:
+        text: Full name or search term
+
+    Returns:
+        List of phonetic keys, in the order the words appear
+    """
+    if not text:
+        return []
+
+    codes = []
+    for token in re.split(r'[\s\-\']+', text):
+        if _strip_accents(token) in _PARTICLES:
+            continue
+        code = phonetic_code(token)
+        if code and code not in codes:
+            codes.append(code)
+    return codes
@@ -0,0 +1,59 @@
+"""
+Helpers shared by the Flask and ASGI public results portals.
+Tokens and ETags issued by either service are accepted by the other.
+"""
+
+import hashlib
+from typing import Any, Dict, Tuple
+from utils.normalization import normalize_cpf
+
+# Lifetime of the signed tokens that authorise GET /results/<token>
+RESULTS_TOKEN_MAX_AGE = 24 * 3600
+
+# Browsers may reuse a result for this long before revalidating with If-None-Match
+RESULTS_CACHE_MAX_AGE = 60
+
+RESULT_TOKEN_SALT = 'portal-result'
+
+def portal_credentials(data: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Normalised (access code, CPF digits) from a portal request body.
+    """
+    return data['access_code'].upper().strip(), normalize_cpf(data['cpf'])
+
+def token_serializer(secret: str, salt: str = RESULT_TOKEN_SALT):
+    from itsdangerous import URLSafeTimedSerializer
+
+    return URLSafeTimedSerializer(secret, salt=salt)
+
+def read_token(secret: str, token: str, salt: str = RESULT_TOKEN_SALT, max_age: int = RESULTS_TOKEN_MAX_AGE):
+    """Payload of a valid, unexpired token, or None"""
+    from itsdangerous import BadSignature
+
+    try:
+        return token_serializer(secret, salt).loads(token, max_age=max_age)
+    except BadSignature:
+        return None
+
+def result_stamp_sql(id_placeholder: str) -> str:
+    """
+    Version stamp of everything a result document shows: the result, its
+    animal, its tutor and its images (the count catches removed images).
+    Returns (id, stamp, image_count); id_placeholder is ':id' or '%(id)s'.
+    """
+    return f"""
+        SELECT e.id,
+               GREATEST(COALESCE(e.updated_at, e.created_at), a.updated_at, t.updated_at, i.updated_at) AS stamp,
+               COALESCE(i.image_count, 0) AS image_count
+        FROM exam_results e
+        JOIN animals a ON a.id = e.animal_id
+        JOIN tutors t ON t.id = a.tutor_id
+        LEFT JOIN LATERAL (
+            SELECT max(updated_at) AS updated_at, count(*) AS image_count
+            FROM exam_images WHERE exam_result_id = e.id
+        ) i ON true
+        WHERE e.id = {id_placeholder}
+    """
+
+def result_etag(exam_result_id, stamp, image_count=0) -> str:
+    return hashlib.sha256(f'{exam_result_id}:{stamp.isoformat()}:{image_count}'.encode()).hexdigest()[:32]
@@ -0,0 +1,97 @@
+"""
+Token bucket rate limiting with pluggable storage.
+MemoryBucketStore keeps buckets in this process; RedisBucketStore shares them
+between workers and machines through an atomic Lua script.
+"""
+
+import threading
+import time
+from typing import Tuple
+from utils.cache import TTLCache
+
+class MemoryBucketStore:
+    def __init__(self, maxsize: int = 100000):
+        """
+        Args:
+            maxsize: Maximum number of buckets kept; least recently used are dropped
+        """
+        self._buckets = TTLCache(maxsize)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, period: float, cost: int = 1) -> Tuple[bool, float]:
+        """
+        Take tokens from a bucket that refills capacity tokens every period seconds.
+
+        Returns:
+            (allowed, retry_after); retry_after is 0 when allowed
+        """
+        rate = capacity / period
+        now = time.monotonic()
+
+        with self._lock:
+            hit, bucket = self._buckets.get(key)
+            tokens, updated = bucket if hit else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+
+            if tokens >= cost:
+                # A bucket that has refilled completely is indistinguishable from a new one
+                self._buckets.set(key, (tokens - cost, now), period)
+                return True, 0.0
+
+            self._buckets.set(key, (tokens, now), period)
+            return False, (cost - tokens) / rate
+
+class RedisBucketStore:
+    # KEYS[1] bucket; ARGV capacity, rate per second, cost, ttl in ms
+    SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+if allowed == 1 then
+    return {1, '0'}
+end
+return {0, tostring((cost - tokens) / rate)}
+"""
+
+    def __init__(self, url: str, prefix: str = 'ratelimit:'):
+        """
+        Args:
+            url: redis:// URL of the shared store
+            prefix: Namespace for bucket keys
+        """
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def take(self, key: str, capacity: int, period: float, cost: int = 1) -> Tuple[bool, float]:
+        allowed, retry_after = self._script(
+            keys=[self.prefix + key],
+            args=[capacity, capacity / period, cost, int(period * 1000)]
+        )
+        return bool(allowed), float(retry_after)
+
+def create_bucket_store(url: str = None):
+    """
+    Storage for the given URL: redis:// or rediss:// for a shared store,
+    empty or memory:// for buckets local to this process.
+    """
+    if not url or url.startswith('memory://'):
+        return MemoryBucketStore()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBucketStore(url)
+    raise ValueError(f'Unsupported rate limit storage: {url}')